@@ -1,118 +1,373 @@
 import argparse
-from typing import List, Tuple, Optional
+from array import array
+from collections import deque
+import mmap
+from typing import List, Optional
+
+import numpy as np
 
 class SATSolver:
+    __slots__ = ('unit_prop_count', 'decision_count', 'num_vars', 'clauses',
+                 'watches', 'values', 'trail')
+
     def __init__(self):
         self.unit_prop_count = 0
         self.decision_count = 0
+        self.num_vars = 0
+        self.clauses: List[array] = []
+        self.watches: List[List[int]] = []
+        self.values: array = array('b')
+        self.trail: List[int] = []
 
-    def unit_propagation(self, cnf: List[List[int]], assignments: List[int]) -> Tuple[List[List[int]], List[int]]:
+    def watch_index(self, literal: int) -> int:
         """
-        Perform unit propagation on the CNF formula.
-        
+        Map a signed literal to its slot in the watch table.
+
         Args:
-        cnf: The CNF formula represented as a list of clauses.
-        assignments: Current variable assignments.
-        
+        literal: The literal (positive or negative integer).
+
         Returns:
-        Updated CNF and assignments after unit propagation.
-        """
-        i = 0
-        while i < len(cnf):
-            if len(cnf[i]) == 1:
-                literal = cnf[i][0]
-                cnf, assignments = self.assign_variable(cnf, assignments, literal)
-                i = 0  # Restart from the beginning
-                continue
-            i += 1
-        return cnf, assignments
+        Index into the watches list.
+        """
+        return literal + self.num_vars
+
+    def literal_value(self, literal: int) -> int:
+        """
+        Look up the current truth value of a literal.
+
+        Args:
+        literal: The literal (positive or negative integer).
+
+        Returns:
+        1 if the literal is true, -1 if false, 0 if unassigned.
+        """
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
 
-    def assign_variable(self, cnf: List[List[int]], assignments: List[int], literal: int) -> Tuple[List[List[int]], List[int]]:
+    def assign_variable(self, literal: int) -> None:
         """
-        Assign a value to a variable and simplify the CNF formula.
-        
+        Assign a literal to true and record it on the trail.
+
         Args:
-        cnf: The CNF formula represented as a list of clauses.
-        assignments: Current variable assignments.
         literal: The literal to assign (positive or negative integer).
-        
+        """
+        self.values[abs(literal)] = 1 if literal > 0 else -1
+        self.trail.append(literal)
+
+    def backtrack(self, trail_mark: int) -> None:
+        """
+        Undo all assignments made after the given trail position.
+
+        Args:
+        trail_mark: Length of the trail to roll back to.
+        """
+        while len(self.trail) > trail_mark:
+            literal = self.trail.pop()
+            self.values[abs(literal)] = 0
+
+    def unit_propagation(self, literal: int) -> bool:
+        """
+        Propagate a freshly assigned literal through the watch lists.
+
+        Only clauses watching the falsified literal are visited; every other
+        clause stays untouched.
+
+        Args:
+        literal: The literal that was just assigned true.
+
         Returns:
-        Updated CNF and assignments after variable assignment.
+        True if propagation succeeded, False on conflict.
         """
-        self.unit_prop_count += 1
-        if abs(literal) not in map(abs, assignments):
-            assignments.append(literal)
-        
-        cnf = [clause for clause in cnf if literal not in clause]
-        cnf = [[l for l in clause if l != -literal] for clause in cnf]
-        return cnf, assignments
+        # Hot loop: locals are much cheaper than attribute lookups
+        unit_prop_count = self.unit_prop_count
+        propagation_queue = deque([literal])
+        while propagation_queue:
+            false_literal = -propagation_queue.popleft()
+            watch_list = self.watches[self.watch_index(false_literal)]
+
+            i = 0
+            while i < len(watch_list):
+                clause_index = watch_list[i]
+                clause = self.clauses[clause_index]
+
+                if len(clause) == 1:
+                    self.unit_prop_count = unit_prop_count
+                    return False
 
-    def solve_2sat(self, cnf: List[List[int]], assignments: List[int]) -> Tuple[bool, List[int]]:
+                # Keep the falsified watch at position 1
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                other_literal = clause[0]
+
+                if self.literal_value(other_literal) == 1:
+                    i += 1
+                    continue
+
+                # Look for a non-false literal to watch instead
+                for j in range(2, len(clause)):
+                    if self.literal_value(clause[j]) != -1:
+                        clause[1], clause[j] = clause[j], clause[1]
+                        self.watches[self.watch_index(clause[1])].append(clause_index)
+                        watch_list.pop(i)
+                        break
+                else:
+                    if self.literal_value(other_literal) == -1:
+                        self.unit_prop_count = unit_prop_count
+                        return False
+                    unit_prop_count += 1
+                    self.assign_variable(other_literal)
+                    propagation_queue.append(other_literal)
+                    i += 1
+        self.unit_prop_count = unit_prop_count
+        return True
+
+    def literal_index(self, literal: int) -> int:
         """
-        Solve the 2-SAT problem using a recursive approach.
-        
+        Map a signed literal to its vertex in the implication graph.
+
         Args:
-        cnf: The CNF formula represented as a list of clauses.
-        assignments: Current variable assignments.
-        
+        literal: The literal (positive or negative integer).
+
         Returns:
-        A tuple (is_satisfiable, assignments)
+        Vertex id in the range [0, 2 * num_vars).
+        """
+        return 2 * (abs(literal) - 1) + (literal < 0)
+
+    def is_2cnf(self) -> bool:
         """
-        cnf, assignments = self.unit_propagation(cnf, assignments)
-        
-        if not cnf:
-            return True, assignments
-        if [] in cnf:
-            return False, assignments
+        Check whether every clause has at most two literals.
 
-        literal = cnf[0][0]
-        self.decision_count += 1
+        Returns:
+        True if the formula is a 2-CNF, False otherwise.
+        """
+        return all(len(clause) <= 2 for clause in self.clauses)
 
-        # Try assigning False to the literal
-        cnf_copy, assignments_copy = self.assign_variable(cnf.copy(), assignments.copy(), -literal)
-        if self.solve_2sat(cnf_copy, assignments_copy)[0]:
-            return True, assignments_copy
+    def build_implication_graph(self) -> List[List[int]]:
+        """
+        Build the implication graph of a 2-CNF formula.
 
-        # Try assigning True to the literal
-        cnf_copy, assignments_copy = self.assign_variable(cnf, assignments, literal)
-        if self.solve_2sat(cnf_copy, assignments_copy)[0]:
-            return True, assignments_copy
+        Each clause (a v b) contributes the edges -a -> b and -b -> a;
+        a unit clause (a) contributes -a -> a.
 
-        return False, assignments
+        Returns:
+        Adjacency lists over 2 * num_vars literal vertices.
+        """
+        adjacency: List[List[int]] = [[] for _ in range(2 * self.num_vars)]
+        for clause in self.clauses:
+            if len(clause) == 1:
+                a = clause[0]
+                adjacency[self.literal_index(-a)].append(self.literal_index(a))
+            else:
+                a, b = clause
+                adjacency[self.literal_index(-a)].append(self.literal_index(b))
+                adjacency[self.literal_index(-b)].append(self.literal_index(a))
+        return adjacency
 
-    def read_cnf(self, filename: str) -> List[List[int]]:
+    def compute_sccs(self, adjacency: List[List[int]]) -> array:
         """
-        Read a CNF formula from a file.
-        
+        Compute strongly connected components with iterative Tarjan.
+
+        An explicit work stack of (vertex, next child) pairs replaces
+        recursion, so the graph size is not limited by the Python
+        recursion depth.
+
         Args:
-        filename: The name of the file containing the CNF formula.
-        
+        adjacency: Adjacency lists of the implication graph.
+
         Returns:
-        The CNF formula represented as a list of clauses.
+        Component id per vertex, numbered in reverse topological order.
         """
-        cnf = []
-        with open(filename, "r") as f:
-            for line in f:
-                if line.startswith(("c", "p")):
+        num_nodes = len(adjacency)
+        index = array('i', [-1] * num_nodes)
+        lowlink = array('i', [0] * num_nodes)
+        scc_id = array('i', [-1] * num_nodes)
+        on_stack = array('b', [0] * num_nodes)
+        scc_stack: List[int] = []
+        next_index = 0
+        next_scc = 0
+
+        for root in range(num_nodes):
+            if index[root] != -1:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child = work.pop()
+                if child == 0:
+                    index[node] = lowlink[node] = next_index
+                    next_index += 1
+                    scc_stack.append(node)
+                    on_stack[node] = 1
+
+                descended = False
+                neighbors = adjacency[node]
+                for i in range(child, len(neighbors)):
+                    successor = neighbors[i]
+                    if index[successor] == -1:
+                        work.append((node, i + 1))
+                        work.append((successor, 0))
+                        descended = True
+                        break
+                    if on_stack[successor]:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                if descended:
                     continue
-                clause = [int(literal) for literal in line.split() if literal != '0']
-                cnf.append(clause)
-        return cnf
+
+                if lowlink[node] == index[node]:
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack[member] = 0
+                        scc_id[member] = next_scc
+                        if member == node:
+                            break
+                    next_scc += 1
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+        return scc_id
+
+    def solve_scc(self) -> bool:
+        """
+        Solve a 2-CNF formula via implication-graph SCCs in O(N + M).
+
+        The formula is unsatisfiable iff a variable shares a component with
+        its negation; otherwise each variable takes the polarity whose
+        component comes later in topological order.
+
+        Returns:
+        True if the formula is satisfiable, False otherwise.
+        """
+        if any(len(clause) == 0 for clause in self.clauses):
+            return False
+
+        scc_id = self.compute_sccs(self.build_implication_graph())
+        for var in range(1, self.num_vars + 1):
+            pos = scc_id[self.literal_index(var)]
+            neg = scc_id[self.literal_index(-var)]
+            if pos == neg:
+                return False
+            # Tarjan numbers components in reverse topological order
+            self.assign_variable(var if pos < neg else -var)
+        return True
+
+    def next_unassigned_literal(self) -> Optional[int]:
+        """
+        Find the next unassigned variable to branch on.
+
+        Returns:
+        The variable as a positive literal, or None if all are assigned.
+        """
+        for var in range(1, self.num_vars + 1):
+            if self.values[var] == 0:
+                return var
+        return None
+
+    def solve_2sat(self) -> bool:
+        """
+        Solve the formula by branching with trail-based backtracking.
+
+        The search is iterative: an explicit decision stack records each
+        decision literal and its trail mark, so conflicts unwind by popping
+        stack entries instead of returning through recursion frames. Each
+        variable is tried negative first, then positive, as before.
+
+        Returns:
+        True if the formula is satisfiable, False otherwise.
+        """
+        decision_stack: List[tuple] = []
+
+        while True:
+            literal = self.next_unassigned_literal()
+            if literal is None:
+                return True
+            self.decision_count += 1
+
+            decision = -literal
+            trail_mark = len(self.trail)
+            while True:
+                self.assign_variable(decision)
+                if self.unit_propagation(decision):
+                    decision_stack.append((decision, trail_mark))
+                    break
+                self.backtrack(trail_mark)
+                # A positive decision means its negation was already tried;
+                # unwind to the most recent decision with an untried polarity
+                while decision > 0:
+                    if not decision_stack:
+                        return False
+                    decision, trail_mark = decision_stack.pop()
+                    self.backtrack(trail_mark)
+                decision = -decision
+
+    def propagate_initial_units(self) -> bool:
+        """
+        Assign all unit clauses of the input formula.
+
+        Returns:
+        True if no conflict was found, False otherwise.
+        """
+        for clause in self.clauses:
+            if len(clause) == 0:
+                return False
+            if len(clause) == 1:
+                literal = clause[0]
+                value = self.literal_value(literal)
+                if value == -1:
+                    return False
+                if value == 0:
+                    self.unit_prop_count += 1
+                    self.assign_variable(literal)
+                    if not self.unit_propagation(literal):
+                        return False
+        return True
+
+    def read_cnf(self, filename: str) -> None:
+        """
+        Read a CNF formula from a file and build the watch lists.
+
+        The DIMACS body is parsed in one vectorized pass: comment and
+        problem lines are stripped, the rest is converted to a single int32
+        array, and clauses are split on the 0 delimiters.
+
+        Args:
+        filename: The name of the file containing the CNF formula.
+        """
+        with open(filename, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                body = b" ".join(line for line in data[:].splitlines()
+                                 if not line.startswith((b"c", b"p")))
+
+        literals = np.fromstring(body.decode(), dtype=np.int32, sep=' ')
+        delimiters = np.flatnonzero(literals == 0)
+        # array('i') keeps literals unboxed (4 bytes each) and hands the
+        # propagation loop plain Python ints instead of NumPy scalars
+        self.clauses = [array('i', sorted(chunk[:-1].tolist(), key=abs))
+                        for chunk in np.split(literals, delimiters + 1)
+                        if chunk.size >= 1 and chunk[-1] == 0]
+        self.num_vars = int(np.abs(literals).max(initial=0))
+
+        self.values = array('b', [0] * (self.num_vars + 1))
+        self.watches = [[] for _ in range(2 * self.num_vars + 1)]
+        for clause_index, clause in enumerate(self.clauses):
+            for literal in clause[:2]:
+                self.watches[self.watch_index(literal)].append(clause_index)
 
     def solve(self, filename: str = 'input.cnf') -> None:
         """
         Solve the SAT problem for the given input file and print the results.
-        
+
         Args:
         filename: The name of the file containing the CNF formula.
         """
         print(f"c Filename: {filename}")
-        cnf = self.read_cnf(filename)
-        is_satisfiable, assignments = self.solve_2sat(cnf, [])
-        
+        self.read_cnf(filename)
+        if self.is_2cnf():
+            is_satisfiable = self.solve_scc()
+        else:
+            is_satisfiable = self.propagate_initial_units() and self.solve_2sat()
+
         print(f"s {'SATISFIABLE' if is_satisfiable else 'UNSATISFIABLE'}")
         if is_satisfiable:
-            print(f"c {' '.join(map(str, sorted(assignments, key=abs)))}")
+            print(f"c {' '.join(map(str, sorted(self.trail, key=abs)))}")
         print(f"c Unit Propagations: {self.unit_prop_count}")
         print(f"c Decisions: {self.decision_count}")
 
@@ -125,4 +380,4 @@ def main():
     solver.solve(args.input)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
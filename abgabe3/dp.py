@@ -1,12 +1,21 @@
 import argparse
-from collections import defaultdict
+from bisect import bisect_left
+from collections import defaultdict, deque
+import mmap
 import sys
 import time
-import heapq
+
+import numpy as np
+
+from dp_kernels import encode_clauses
 
 class DavisPutnamSolver:
+    __slots__ = ('num_vars', 'unit_propagation_count', 'resolution_count',
+                 'pure_literal_elimination_count', 'subsumption_count')
+
     def __init__(self):
         # Initialize counters for various operations
+        self.num_vars = 0
         self.unit_propagation_count = 0
         self.resolution_count = 0
         self.pure_literal_elimination_count = 0
@@ -24,117 +33,259 @@ class DavisPutnamSolver:
         """
         return frozenset(clause)
 
+    def encode_cnf(self, clauses: list[frozenset[int]], num_vars: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Encode clauses as positive/negative uint64 bitmask rows.
+
+        Args:
+            clauses: A list of frozensets representing clauses in CNF.
+            num_vars: The largest variable index occurring in the clauses.
+
+        Returns:
+            Two arrays of shape (len(clauses), ceil(num_vars/64)); row i has
+            the bit of variable v set where v occurs positively (negatively).
+        """
+        num_words = max(1, (num_vars + 63) // 64)
+        offsets = np.zeros(len(clauses) + 1, dtype=np.int32)
+        np.cumsum([len(clause) for clause in clauses], out=offsets[1:])
+        flat_literals = np.fromiter(
+            (literal for clause in clauses for literal in clause),
+            dtype=np.int32, count=int(offsets[-1]))
+        return encode_clauses(flat_literals, offsets, num_words)
+
+    def count_vars(self, cnf: set[frozenset[int]]) -> int:
+        """
+        Determine the largest variable index in the CNF formula.
+
+        Args:
+            cnf: A set of frozensets representing clauses in CNF.
+
+        Returns:
+            The largest absolute literal value, or 0 for an empty formula.
+        """
+        return max((abs(literal) for clause in cnf for literal in clause), default=0)
+
     def perform_subsumption_elimination(self, cnf: set[frozenset[int]]) -> set[frozenset[int]]:
         """
         Perform subsumption elimination on the CNF formula.
-        
+
+        Clauses are compared as bitmask rows, so each subset test is a
+        word-wise AND over 64 literals at a time instead of a frozenset call.
+        A clause can only subsume clauses that contain all of its literals,
+        so candidates are narrowed through an inverted literal index: only
+        the posting list of the clause's rarest literal is checked.
+
         Args:
             cnf: A set of frozensets representing clauses in CNF.
-        
+
         Returns:
             A new set of frozensets with subsumed clauses removed.
         """
-        sorted_clauses = sorted(cnf, key=len)
-        i = 0
-        while i < len(sorted_clauses):
-            current_clause = sorted_clauses[i]
-            j = i + 1
-            subsumed = False
-            while j < len(sorted_clauses):
-                if current_clause.issubset(sorted_clauses[j]):
-                    sorted_clauses.pop(j)
-                    self.subsumption_count += 1
-                elif sorted_clauses[j].issubset(current_clause):
-                    subsumed = True
-                    break
-                else:
-                    j += 1
-            if subsumed:
-                sorted_clauses.pop(i)
-            else:
-                i += 1
-        return set(sorted_clauses)
+        clauses = sorted(cnf, key=len)
+        if len(clauses) < 2:
+            return set(clauses)
+
+        pos, neg = self.encode_cnf(clauses, self.count_vars(cnf))
+        lengths = np.fromiter((len(clause) for clause in clauses),
+                              dtype=np.int32, count=len(clauses))
+        posting = defaultdict(list)
+        for i, clause in enumerate(clauses):
+            for literal in clause:
+                posting[literal].append(i)
+
+        alive = np.ones(len(clauses), dtype=bool)
+        for i, clause in enumerate(clauses):
+            if not alive[i]:
+                continue
+            if not clause:
+                # The empty clause subsumes everything after it
+                self.subsumption_count += int(alive[i + 1:].sum())
+                alive[i + 1:] = False
+                break
+            rarest = min(clause, key=lambda l: len(posting[l]))
+            # Distinct clauses of equal length cannot subsume each other,
+            # so only strictly longer clauses are candidates
+            first_longer = int(np.searchsorted(lengths, lengths[i], side='right'))
+            posting_list = posting[rarest]
+            candidates = np.array(posting_list[bisect_left(posting_list, first_longer):],
+                                  dtype=np.intp)
+            if candidates.size == 0:
+                continue
+            # Drop already-subsumed rows before the word-wise subset test
+            candidates = candidates[alive[candidates]]
+            if candidates.size == 0:
+                continue
+            subsumed = (np.all((pos[i] & pos[candidates]) == pos[i], axis=1)
+                        & np.all((neg[i] & neg[candidates]) == neg[i], axis=1))
+            self.subsumption_count += int(subsumed.sum())
+            alive[candidates[subsumed]] = False
+        return {clause for clause, keep in zip(clauses, alive) if keep}
 
     def remove_tautologies(self, cnf: set[frozenset[int]]) -> set[frozenset[int]]:
         """
         Remove tautological clauses from the CNF formula.
-        
+
         Args:
             cnf: A set of frozensets representing clauses in CNF.
-        
+
         Returns:
             A new set of frozensets with tautologies removed.
         """
-        return {clause for clause in cnf if not any(-literal in clause for literal in clause)}
+        clauses = list(cnf)
+        if not clauses:
+            return cnf
+        pos, neg = self.encode_cnf(clauses, self.count_vars(cnf))
+        keep_mask = ~np.any(pos & neg, axis=1)
+        return {clause for clause, keep in zip(clauses, keep_mask) if keep}
 
-    def perform_pure_literal_elimination(self, cnf: set[frozenset[int]], literal_counts: dict) -> set[frozenset[int]]:
+    def perform_pure_literal_elimination(self, cnf: set[frozenset[int]]) -> set[frozenset[int]]:
         """
         Perform pure literal elimination on the CNF formula.
-        
+
+        Pure literals are found by OR-ing the positive and negative bitmask
+        rows across all clauses and keeping the bits set on only one side.
+
         Args:
             cnf: A set of frozensets representing clauses in CNF.
-            literal_counts: A dictionary counting occurrences of each literal.
-        
+
         Returns:
             A new set of frozensets with clauses containing pure literals removed.
         """
-        pure_literals = {lit for lit, count in literal_counts.items() if -lit not in literal_counts}
-        clauses_before = len(cnf)
-        cnf = {clause for clause in cnf if not clause & pure_literals}
-        self.pure_literal_elimination_count += clauses_before - len(cnf)
-        return cnf
+        clauses = list(cnf)
+        if not clauses:
+            return cnf
+        pos, neg = self.encode_cnf(clauses, self.count_vars(cnf))
+        any_pos = np.bitwise_or.reduce(pos, axis=0)
+        any_neg = np.bitwise_or.reduce(neg, axis=0)
+        pure_pos = any_pos & ~any_neg
+        pure_neg = any_neg & ~any_pos
+        keep_mask = ~(np.any(pos & pure_pos, axis=1) | np.any(neg & pure_neg, axis=1))
+        self.pure_literal_elimination_count += int((~keep_mask).sum())
+        return {clause for clause, keep in zip(clauses, keep_mask) if keep}
 
-    def perform_unit_propagation(self, cnf: set[frozenset[int]], literal_counts: dict) -> set[frozenset[int]]:
+    def build_literal_counts(self, cnf: set[frozenset[int]], num_vars: int) -> np.ndarray:
+        """
+        Count literal occurrences into a dense array indexed by literal + num_vars.
+
+        Args:
+            cnf: A set of frozensets representing clauses in CNF.
+            num_vars: The largest variable index occurring in the clauses.
+
+        Returns:
+            An int32 array of length 2 * num_vars + 1 with the occurrence
+            count of literal l at index l + num_vars.
+        """
+        counts = np.zeros(2 * num_vars + 1, dtype=np.int32)
+        flat = np.fromiter((literal for clause in cnf for literal in clause),
+                           dtype=np.int32)
+        np.add.at(counts, flat + num_vars, 1)
+        return counts
+
+    def perform_unit_propagation(self, cnf: set[frozenset[int]], literal_counts: np.ndarray) -> set[frozenset[int]]:
         """
         Perform unit propagation on the CNF formula.
-        
+
         Args:
             cnf: A set of frozensets representing clauses in CNF.
-            literal_counts: A dictionary counting occurrences of each literal.
-        
+            literal_counts: Dense occurrence counts indexed by literal + num_vars.
+
         Returns:
             A new set of frozensets after unit propagation.
         """
-        unit_clauses = [clause for clause in cnf if len(clause) == 1]
-        while unit_clauses:
-            unit = unit_clauses.pop()
-            literal = next(iter(unit))
-            cnf = {c for c in cnf if literal not in c}
-            cnf = {frozenset(l for l in c if l != -literal) for c in cnf}
-            self.unit_propagation_count += 1
-            literal_counts[literal] -= 1
-            if literal_counts[literal] == 0:
-                del literal_counts[literal]
-            literal_counts[-literal] = 0
-            unit_clauses.extend([c for c in cnf if len(c) == 1])
+        pending = deque(next(iter(clause)) for clause in cnf if len(clause) == 1)
+        if not pending:
+            return cnf
+
+        # Index binary clauses as implication edges: assigning l forces
+        # every x with a clause (-l v x), without touching the clause set
+        binary_impl = defaultdict(list)
+        for clause in cnf:
+            if len(clause) == 2:
+                a, b = clause
+                binary_impl[-a].append(b)
+                binary_impl[-b].append(a)
+
+        # Occurrence lists keyed by literal: a batch rewrite then only
+        # visits the clauses containing an assigned literal or its
+        # negation instead of rescanning the whole clause set
+        occurrences = defaultdict(set)
+        for clause in cnf:
+            for literal in clause:
+                occurrences[literal].add(clause)
+
+        cnf = set(cnf)
+        assigned = set()
+        while pending:
+            # Close the pending units transitively over the binary edges
+            batch = set()
+            while pending:
+                literal = pending.popleft()
+                if literal in assigned or literal in batch:
+                    continue
+                if -literal in assigned or -literal in batch:
+                    return cnf | {frozenset()}  # Contradicting units
+                batch.add(literal)
+                pending.extend(binary_impl[literal])
+
+            self.unit_propagation_count += len(batch)
+            for literal in batch:
+                literal_counts[literal + self.num_vars] -= 1
+                literal_counts[-literal + self.num_vars] = 0
+
+            # One rewrite of the affected clauses covers the whole batch
+            negated_batch = {-literal for literal in batch}
+            affected = set()
+            for literal in batch:
+                affected |= occurrences[literal]
+                affected |= occurrences[-literal]
+            for clause in affected:
+                if clause not in cnf:
+                    continue  # Already removed by an earlier batch
+                cnf.remove(clause)
+                if clause & batch:
+                    continue
+                clause = clause - negated_batch
+                cnf.add(clause)
+                for literal in clause:
+                    occurrences[literal].add(clause)
+                if len(clause) == 1:
+                    pending.append(next(iter(clause)))
+            assigned |= batch
         return cnf
 
-    def resolve_clauses(self, clause1: frozenset[int], clause2: frozenset[int], literal: int) -> set[frozenset[int]]:
+    def resolve_clauses(self, clause1: frozenset[int], clause2: frozenset[int], literal: int) -> frozenset[int] | None:
         """
         Resolve two clauses on a given literal.
-        
+
         Args:
             clause1, clause2: Frozensets representing the clauses to resolve.
             literal: The literal to resolve on.
-        
+
         Returns:
-            A set containing the resolved clause (if not tautological).
+            The resolved clause, or None if it is tautological.
         """
         self.resolution_count += 1
-        merged = heapq.merge(clause1, clause2, key=abs)
-        return {frozenset(l for l in merged if l != literal and l != -literal)}
+        resolvent = (clause1 | clause2) - {literal, -literal}
+        # A variable left in both polarities makes the resolvent trivially
+        # true; dropping it here keeps it out of the clause set entirely
+        if len({abs(l) for l in resolvent}) < len(resolvent):
+            return None
+        return resolvent
 
-    def select_literal(self, literal_counts: dict) -> int:
+    def select_literal(self, literal_counts: np.ndarray) -> int:
         """
         Select a literal for branching based on occurrence counts.
-        
+
         Args:
-            literal_counts: A dictionary counting occurrences of each literal.
-        
+            literal_counts: Dense occurrence counts indexed by literal + num_vars.
+
         Returns:
             The selected literal (an integer).
         """
-        return max(literal_counts, key=lambda l: literal_counts[l] + literal_counts.get(-l, 0))
+        # Reversing the array lines the count of -l up with that of l
+        scores = literal_counts + literal_counts[::-1]
+        scores[self.num_vars] = -1  # Index of "literal 0", never selectable
+        return int(np.argmax(scores)) - self.num_vars
 
     def davis_putnam(self, cnf: set[frozenset[int]]) -> bool:
         """
@@ -146,18 +297,15 @@ class DavisPutnamSolver:
         Returns:
             Boolean indicating whether the formula is satisfiable.
         """
-        literal_counts = defaultdict(int)
-        for clause in cnf:
-            for lit in clause:
-                literal_counts[lit] += 1
+        self.num_vars = self.count_vars(cnf)
+        literal_counts = self.build_literal_counts(cnf, self.num_vars)
 
         while True:
             prev_cnf_size = -1
             while prev_cnf_size != len(cnf):
                 prev_cnf_size = len(cnf)
                 cnf = self.perform_unit_propagation(cnf, literal_counts)
-                cnf = self.remove_tautologies(cnf)
-                cnf = self.perform_pure_literal_elimination(cnf, literal_counts)
+                cnf = self.perform_pure_literal_elimination(cnf)
                 cnf = self.perform_subsumption_elimination(cnf)
 
             if not cnf:
@@ -168,21 +316,32 @@ class DavisPutnamSolver:
             chosen_literal = self.select_literal(literal_counts)
             new_clauses = set()
 
-            pos_clauses = [c for c in cnf if chosen_literal in c]
-            neg_clauses = [c for c in cnf if -chosen_literal in c]
+            # One pass builds the occurrence lists of both polarities and
+            # the untouched remainder; resolution is then exactly the
+            # Cartesian product of the two lists
+            pos_clauses, neg_clauses, remaining = [], [], set()
+            for clause in cnf:
+                if chosen_literal in clause:
+                    pos_clauses.append(clause)
+                elif -chosen_literal in clause:
+                    neg_clauses.append(clause)
+                else:
+                    remaining.add(clause)
 
             for c1 in pos_clauses:
                 for c2 in neg_clauses:
-                    new_clauses |= self.resolve_clauses(c1, c2, chosen_literal)
+                    resolvent = self.resolve_clauses(c1, c2, chosen_literal)
+                    if resolvent is not None:
+                        new_clauses.add(resolvent)
 
-            cnf = new_clauses | {c for c in cnf if chosen_literal not in c and -chosen_literal not in c}
+            cnf = new_clauses | remaining
             
             for clause in new_clauses:
                 for lit in clause:
-                    literal_counts[lit] += 1
+                    literal_counts[lit + self.num_vars] += 1
 
-            literal_counts[chosen_literal] = 0
-            literal_counts[-chosen_literal] = 0
+            literal_counts[chosen_literal + self.num_vars] = 0
+            literal_counts[-chosen_literal + self.num_vars] = 0
 
     def read_cnf_file(self, filename: str) -> set[frozenset[int]]:
         """
@@ -191,18 +350,27 @@ class DavisPutnamSolver:
         Args:
             filename: The name of the file to read from.
         
+        The DIMACS body is parsed in one vectorized pass: comment and
+        problem lines are stripped, the rest is converted to a single int32
+        array, and clauses are split on the 0 delimiters.
+
         Returns:
             A set of frozensets representing the CNF formula.
         """
-        cnf = set()
-        with open(filename, "r") as f:
-            for line in f:
-                if line.startswith("c") or line.startswith("p"):
-                    continue  # Skip comments and problem line
-                clause = frozenset(int(lit) for lit in line.split()[:-1])  # Last 0 is delimiter
-                if clause:  # Ignore empty clauses
-                    cnf.add(clause)
-        return cnf
+        with open(filename, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                body = b" ".join(line for line in data[:].splitlines()
+                                 if not line.startswith((b"c", b"p")))
+
+        literals = np.fromstring(body.decode(), dtype=np.int32, sep=' ')
+        delimiters = np.flatnonzero(literals == 0)
+        cnf = {frozenset(chunk[:-1].tolist())
+               for chunk in np.split(literals, delimiters + 1)
+               if chunk.size > 1 and chunk[-1] == 0}  # Ignore empty clauses
+        # Propagation, pure-literal elimination and subsumption only drop
+        # literals or clauses, so one sweep at ingest keeps the input
+        # formula tautology-free; only resolvents need re-checking later.
+        return self.remove_tautologies(cnf)
 
 if __name__ == "__main__":
     # Set up command-line argument parsing
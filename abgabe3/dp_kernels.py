@@ -0,0 +1,38 @@
+"""Numba-compiled kernels for the Davis-Putnam solver.
+
+The kernels operate on flat int32 literal arrays with clause offsets and on
+uint64 bitmask rows, so the hot loops run as typed machine code instead of
+interpreted Python.
+"""
+from numba import njit
+import numpy as np
+
+
+@njit(cache=True)
+def encode_clauses(flat_literals, offsets, num_words):
+    """
+    Encode flat clauses as positive/negative uint64 bitmask rows.
+
+    Args:
+        flat_literals: All clause literals concatenated into one int32 array.
+        offsets: int32 array with clause i spanning offsets[i]:offsets[i+1].
+        num_words: Number of 64-bit words per bitmask row.
+
+    Returns:
+        Two uint64 arrays of shape (num_clauses, num_words) holding the
+        positive and negative literal bits per clause.
+    """
+    num_clauses = offsets.shape[0] - 1
+    pos = np.zeros((num_clauses, num_words), dtype=np.uint64)
+    neg = np.zeros((num_clauses, num_words), dtype=np.uint64)
+    for i in range(num_clauses):
+        for k in range(offsets[i], offsets[i + 1]):
+            literal = flat_literals[k]
+            var = abs(literal) - 1
+            bit = np.uint64(1) << np.uint64(var & 63)
+            if literal > 0:
+                pos[i, var >> 6] |= bit
+            else:
+                neg[i, var >> 6] |= bit
+    return pos, neg
+
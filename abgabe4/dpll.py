@@ -1,7 +1,32 @@
 import argparse
 import logging
+import mmap
+import multiprocessing
 import time
 import resource
+from array import array
+from collections import deque
+
+import numpy as np
+
+from dpll_kernels import pure_literals
+
+def solve_branch(args):
+    """
+    Worker entry point for the parallel root split: force one polarity of
+    the root decision variable and search that half of the tree.
+    Returns (is_satisfiable, solution, counter totals).
+    """
+    solver, literal = args
+    # The buffer view does not survive pickling; rebind it to the copy
+    solver.values_view = np.frombuffer(solver.values, dtype=np.int8)[1:]
+    solver.assign_variable(literal)
+    if solver.unit_propagation(literal):
+        is_satisfiable, solution = solver.DPLL()
+    else:
+        is_satisfiable, solution = False, None
+    return (is_satisfiable, solution, solver.unit_propagation_count,
+            solver.decision_count)
 
 class DPLL_Solver:
     def __init__(self, enable_pure_literal_elimination):
@@ -9,144 +34,327 @@ class DPLL_Solver:
         self.unit_propagation_count = 0
         self.decision_count = 0
         self.pure_literal_elimination_count = 0
-        
-    def unit_propagation(self, cnf, assigned_literals):
+        self.num_vars = 0
+        self.variables = []
+        self.clauses = []
+        self.watches = []
+        self.values = array('b')
+        self.values_view = None
+        self.trail = []
+        self.pos = None
+        self.neg = None
+
+    def setup(self, cnf):
         """
-        Simplifies the given CNF formula based on current variable assignments.
-        Identifies unit clauses and updates the assignments accordingly.
+        Build the solver state from a CNF given as a set of frozen sets.
+        Clauses become mutable literal lists (sorted by variable) with the
+        first two literals of each clause watched; the packed uint64 clause
+        rows are only built when pure literal elimination is enabled.
         """
-        for clause in cnf:
-            unresolved_literals = set()
-            sole_unassigned_literal = None
+        self.num_vars = max((abs(literal) for clause in cnf for literal in clause),
+                            default=0)
+        # Short clauses first: they are the likeliest to become unit or
+        # conflicting, so propagation visits them early in each watch list.
+        # array('i') keeps literals unboxed (4 bytes each) and hands the
+        # propagation loop plain Python ints instead of NumPy scalars
+        self.clauses = sorted((array('i', sorted(clause, key=abs)) for clause in cnf),
+                              key=len)
+        # Cached once: the clause set never grows during the search, so
+        # decisions only ever need to consider these variables. Branching
+        # on frequent variables first keeps the search tree small, so they
+        # are ordered by occurrence count (both polarities combined).
+        counts = np.zeros(2 * self.num_vars + 1, dtype=np.int64)
+        flat = np.fromiter((literal for clause in self.clauses for literal in clause),
+                           dtype=np.int64)
+        np.add.at(counts, flat + self.num_vars, 1)
+        # Reversing the array lines the count of -v up with that of v
+        scores = (counts + counts[::-1])[self.num_vars:]
+        self.variables = sorted(np.flatnonzero(scores[1:]) + 1,
+                                key=lambda var: -scores[var])
+        self.variables = [int(var) for var in self.variables]
+        self.values = array('b', [0] * (self.num_vars + 1))
+        # Zero-copy int8 view of the same buffer for the vectorized passes;
+        # the interpreter loops keep indexing the array directly, which
+        # hands back plain ints instead of boxed NumPy scalars
+        self.values_view = np.frombuffer(self.values, dtype=np.int8)[1:]
+        self.watches = [[] for _ in range(2 * self.num_vars + 1)]
+        for clause_index, clause in enumerate(self.clauses):
+            for literal in clause[:2]:
+                self.watches[self.watch_index(literal)].append(clause_index)
+        if self.enable_pure_literal_elimination:
+            self.build_bitset_cnf()
 
+    def build_bitset_cnf(self):
+        """
+        Encode the clauses as packed uint64 bitmask rows for the pure
+        literal kernel. Clause i has the bit of variable v set in pos[i]
+        (neg[i]) when v occurs positively (negatively).
+        """
+        num_words = max(1, (self.num_vars + 63) // 64)
+        self.pos = np.zeros((len(self.clauses), num_words), dtype=np.uint64)
+        self.neg = np.zeros((len(self.clauses), num_words), dtype=np.uint64)
+        for i, clause in enumerate(self.clauses):
             for literal in clause:
-                if literal in assigned_literals:
-                    unresolved_literals.clear()
-                    break
-                if -literal in assigned_literals:
+                var = abs(literal) - 1
+                target = self.pos if literal > 0 else self.neg
+                target[i, var >> 6] |= np.uint64(1) << np.uint64(var & 63)
+
+    def watch_index(self, literal):
+        """
+        Map a signed literal to its slot in the watch table.
+        """
+        return literal + self.num_vars
+
+    def literal_value(self, literal):
+        """
+        Look up the current truth value of a literal:
+        1 if true, -1 if false, 0 if unassigned.
+        """
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def assign_variable(self, literal):
+        """
+        Assign a literal to true and record it on the trail.
+        """
+        self.values[abs(literal)] = 1 if literal > 0 else -1
+        self.trail.append(literal)
+
+    def backtrack(self, trail_mark):
+        """
+        Undo all assignments made after the given trail position.
+        """
+        while len(self.trail) > trail_mark:
+            literal = self.trail.pop()
+            self.values[abs(literal)] = 0
+
+    def unit_propagation(self, literal):
+        """
+        Propagate a freshly assigned literal through the watch lists.
+        With two watched literals per clause only the clauses watching the
+        falsified literal are visited; every other clause stays untouched,
+        so propagation cost no longer scales with the formula size.
+        Returns False if a clause becomes empty (conflict).
+        """
+        # Hot loop: locals are much cheaper than attribute lookups
+        unit_propagation_count = self.unit_propagation_count
+        num_vars = self.num_vars
+        watches = self.watches
+        clauses = self.clauses
+        literal_value = self.literal_value
+        propagation_queue = deque([literal])
+        while propagation_queue:
+            false_literal = -propagation_queue.popleft()
+            watch_list = watches[false_literal + num_vars]
+
+            i = 0
+            while i < len(watch_list):
+                clause_index = watch_list[i]
+                clause = clauses[clause_index]
+
+                if len(clause) == 1:
+                    self.unit_propagation_count = unit_propagation_count
+                    return False
+
+                # Keep the falsified watch at position 1
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                other_literal = clause[0]
+
+                if literal_value(other_literal) == 1:
+                    i += 1
                     continue
-                
-                unresolved_literals.add(literal)
-                sole_unassigned_literal = literal
 
-            if len(unresolved_literals) == 1:
-                assigned_literals.add(sole_unassigned_literal)
-                self.unit_propagation_count += 1
+                # Look for a non-false literal to watch instead
+                for j in range(2, len(clause)):
+                    if literal_value(clause[j]) != -1:
+                        clause[1], clause[j] = clause[j], clause[1]
+                        watches[clause[1] + num_vars].append(clause_index)
+                        watch_list.pop(i)
+                        break
+                else:
+                    if literal_value(other_literal) == -1:
+                        self.unit_propagation_count = unit_propagation_count
+                        return False
+                    unit_propagation_count += 1
+                    self.assign_variable(other_literal)
+                    propagation_queue.append(other_literal)
+                    i += 1
+        self.unit_propagation_count = unit_propagation_count
+        return True
 
-        return assigned_literals
-        
-    def pure_literal_elimination(self, cnf, assigned_literals):
+    def propagate_initial_units(self):
         """
-        Performs pure literal elimination on the given CNF formula and assignment.
-        It first collects all literals and their negations in the formula.
-        Then, it checks if a literal and its negation are both not present in the assignment.
-        If so, it adds the pure literal to the assignment and increments the pure_literal_elimination_count.
+        Assign all unit clauses of the input formula.
+        Returns False if they already conflict.
+        """
+        for clause in self.clauses:
+            if len(clause) == 0:
+                return False
+            if len(clause) == 1:
+                literal = clause[0]
+                value = self.literal_value(literal)
+                if value == -1:
+                    return False
+                if value == 0:
+                    self.unit_propagation_count += 1
+                    self.assign_variable(literal)
+                    if not self.unit_propagation(literal):
+                        return False
+        return True
+
+    def assignment_masks(self):
+        """
+        Pack the current assignment into the uint64 masks expected by the
+        pure literal kernel.
+        """
+        num_words = self.pos.shape[1]
+        masks = []
+        for polarity in (1, -1):
+            packed = np.packbits(self.values_view == polarity, bitorder='little')
+            words = np.zeros(num_words * 8, dtype=np.uint8)
+            words[:packed.size] = packed
+            masks.append(words.view(np.uint64))
+        return masks[0], masks[1]
+
+    def pure_literal_elimination(self):
+        """
+        Assign every pure literal of the remaining formula.
+        The compiled kernel ORs the remaining-literal rows of unsatisfied
+        clauses and reports every variable occurring with one polarity
+        only; assigning those literals can only satisfy clauses, so the
+        pass is repeated until it finds nothing new.
         """
         if not self.enable_pure_literal_elimination:
             return
-        all_literals = set()
-        literal_negations = {}
-    
-        # Collect all literals and their negations
-        for clause in cnf:
-            if not any(literal in assigned_literals for literal in clause):
-                for literal in clause:
-                    all_literals.add(literal)
-                    literal_negations[literal] = -literal
-    
-        # Process the literals
-        for literal in all_literals:
-            if literal_negations[literal] in assigned_literals:
-                continue
-            if literal_negations[literal] not in all_literals:
-                assigned_literals.add(literal)
-                self.pure_literal_elimination_count += 1
-    
-        return assigned_literals
-
-    def get_decision_variable(self, cnf, assigned_literals):
-        """
-        Selects the next decision variable for the DPLL algorithm.
-        It keeps track of the number of decisions made using the decision_count.
-        """
-        self.decision_count += 1
-        all_literals = {literal for clause in cnf for literal in clause}
-        unassigned_literals = all_literals - assigned_literals - {-literal for literal in assigned_literals}
-        return next(iter(unassigned_literals))
-
-    def is_finished(self, cnf, assigned_literals):
-        """
-        Checks the current state of the CNF formula and assignment:
-        - Returns 1 if the formula is satisfiable
-        - Returns -1 if the formula is unsatisfiable
-        - Returns 0 if the formula is not yet finished
-        """
-        for clause in cnf:
-            if all(-literal in assigned_literals for literal in clause):
-                return -1 
-            if any(literal in assigned_literals for literal in clause):
-                continue  
-            return 0 
-        return 1 
-
-    def DPLL(self, cnf, assigned_literals=set()):
-        """
-        Implements the DPLL algorithm to solve the given CNF formula.
-        It first performs unit propagation and pure literal elimination until no more can be done.
-        Then, it checks if the formula is satisfiable, unsatisfiable, or still needs more decisions.
-        If more decisions are needed, it recursively calls the DPLL function with the new assignment.
+        while True:
+            assign_true, assign_false = self.assignment_masks()
+            found = pure_literals(self.pos, self.neg, assign_true, assign_false)
+            if found.size == 0:
+                return
+            self.pure_literal_elimination_count += found.size
+            for literal in found.tolist():
+                self.assign_variable(literal)
+                self.unit_propagation(literal)
+
+    def get_decision_variable(self):
         """
+        Selects the next unassigned variable to branch on, or None if all
+        occurring variables are assigned. It keeps track of the number of
+        decisions made using the decision_count.
+        """
+        for var in self.variables:
+            if self.values[var] == 0:
+                self.decision_count += 1
+                return var
+        return None
+
+    def DPLL(self):
+        """
+        Implements the DPLL algorithm on the watched-literal state.
+        The search is iterative: an explicit decision stack records each
+        decision literal and its trail mark, so conflicts unwind by popping
+        stack entries instead of returning through recursion frames. Each
+        variable is tried negative first, then positive, as before.
+        """
+        decision_stack = []
+
         while True:
-            before_len = len(assigned_literals)
-            self.pure_literal_elimination(cnf, assigned_literals)
-            self.unit_propagation(cnf, assigned_literals)
-            if len(assigned_literals) == before_len:
-                break  
-        
-        finished = self.is_finished(cnf, assigned_literals)
-        if finished == 1:
-            return True, assigned_literals
-        elif finished == -1:
+            decision_variable = self.get_decision_variable()
+            if decision_variable is None:
+                return True, set(self.trail)
+
+            decision = -decision_variable
+            trail_mark = len(self.trail)
+            while True:
+                self.assign_variable(decision)
+                if self.unit_propagation(decision):
+                    decision_stack.append((decision, trail_mark))
+                    break
+                self.backtrack(trail_mark)
+                # A positive decision means its negation was already tried;
+                # unwind to the most recent decision with an untried polarity
+                while decision > 0:
+                    if not decision_stack:
+                        return False, None
+                    decision, trail_mark = decision_stack.pop()
+                    self.backtrack(trail_mark)
+                decision = -decision
+
+    def solve(self):
+        """
+        Run initial unit propagation and one pure literal pass, then the
+        DPLL search. Pure literals are a preprocessing step only: the
+        clause set never grows during the search, so a literal that is not
+        pure at the root cannot become pure except through assignments the
+        search explores anyway.
+        Returns (is_satisfiable, solution).
+        """
+        if not self.propagate_initial_units():
+            return False, None
+        self.pure_literal_elimination()
+        return self.DPLL()
+
+    def solve_parallel(self):
+        """
+        Like solve, but the two polarities of the root decision variable
+        are searched by two worker processes at once. The first worker to
+        report SAT wins; UNSAT needs both halves to fail. Deeper splits
+        are not worth the process-spawn cost for this solver.
+        Returns (is_satisfiable, solution).
+        """
+        if not self.propagate_initial_units():
             return False, None
-        
-        decision_var = self.get_decision_variable(cnf, assigned_literals)
-        result_negative = self.DPLL(cnf, assigned_literals | {-decision_var})  
-        if result_negative[0]:
-            return result_negative
-        return self.DPLL(cnf, assigned_literals | {decision_var}) 
-    
+        self.pure_literal_elimination()
+        decision_variable = self.get_decision_variable()
+        if decision_variable is None:
+            return True, set(self.trail)
+
+        base_units = self.unit_propagation_count
+        base_decisions = self.decision_count
+        with multiprocessing.Pool(2) as pool:
+            branches = [(self, -decision_variable), (self, decision_variable)]
+            for result in pool.imap_unordered(solve_branch, branches):
+                is_satisfiable, solution, units, decisions = result
+                self.unit_propagation_count += units - base_units
+                self.decision_count += decisions - base_decisions
+                if is_satisfiable:
+                    pool.terminate()
+                    return True, solution
+        return False, None
+
     def read_cnf(self, filename: str) -> set[frozenset[int]]:
         """
         Reads a CNF formula from the given file and returns it as a set of frozen sets of integers.
         Each frozen set represents a clause, and the set contains all the clauses.
+
+        The DIMACS body is parsed in one vectorized pass: comment and
+        problem lines are stripped, the rest is converted to a single int32
+        array, and clauses are split on the 0 delimiters.
         """
-        cnf = set()
-        with open(filename, "r") as f:
-            lines = f.readlines()
-            for line in lines:
-                # ignore comments and header
-                if line.startswith("c") or line.startswith("p"):
-                    continue
-                clause = set()
-                literals = line.split()
-                for literal in literals:
-                    literal = int(literal)
-                    if literal == 0:
-                        break
-                    clause.add(literal)
-                cnf.add(frozenset(clause))
-        return cnf
+        with open(filename, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                body = b" ".join(line for line in data[:].splitlines()
+                                 if not line.startswith((b"c", b"p")))
+
+        literals = np.fromstring(body.decode(), dtype=np.int32, sep=' ')
+        delimiters = np.flatnonzero(literals == 0)
+        return {frozenset(chunk[:-1].tolist())
+                for chunk in np.split(literals, delimiters + 1)
+                if chunk.size >= 1 and chunk[-1] == 0}
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Implements DPLL Algorithm')
     parser.add_argument('--pure', '-p', action='store_true', help='Enable Pure Literal Elimination')
+    parser.add_argument('--parallel', '-j', action='store_true', help='Search both root branches in parallel')
     parser.add_argument('--input', '-i', default='input.cnf', help='Input file name (default: input.cnf)')
     args = parser.parse_args()
 
     solver = DPLL_Solver(args.pure)
     start_time = time.time()
     cnf = solver.read_cnf(args.input)
-    is_satisfiable, solution = solver.DPLL(cnf)
+    solver.setup(cnf)
+    is_satisfiable, solution = solver.solve_parallel() if args.parallel else solver.solve()
     end_time = time.time()
     peak_memory_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
 
@@ -161,4 +369,4 @@ if __name__ == "__main__":
     print("c Number of Decisions:", solver.decision_count)
     print("c Number of Pure Literal Eliminations:", solver.pure_literal_elimination_count)
 
-    exit(10 if is_satisfiable else 20)
\ No newline at end of file
+    exit(10 if is_satisfiable else 20)
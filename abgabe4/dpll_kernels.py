@@ -0,0 +1,60 @@
+"""Numba-compiled kernels for the DPLL solver.
+
+The kernels operate on packed uint64 clause rows (positive/negative
+literal bits per clause) and assignment masks, so the per-clause scans
+run as typed machine code instead of interpreted Python.
+"""
+from numba import njit
+import numpy as np
+
+
+@njit(cache=True)
+def _popcount(word):
+    count = 0
+    while word:
+        word &= word - np.uint64(1)
+        count += 1
+    return count
+
+
+@njit(cache=True)
+def _is_satisfied(pos, neg, assign_true, assign_false, row):
+    for w in range(pos.shape[1]):
+        if (pos[row, w] & assign_true[w]) or (neg[row, w] & assign_false[w]):
+            return True
+    return False
+
+
+@njit(cache=True)
+def pure_literals(pos, neg, assign_true, assign_false):
+    """
+    Find every literal that occurs with one polarity only among the
+    unsatisfied clauses.
+
+    Returns:
+        An int32 array of the pure literals (positive or negative var ids).
+    """
+    num_clauses, num_words = pos.shape
+    any_pos = np.zeros(num_words, dtype=np.uint64)
+    any_neg = np.zeros(num_words, dtype=np.uint64)
+    for i in range(num_clauses):
+        if _is_satisfied(pos, neg, assign_true, assign_false, i):
+            continue
+        for w in range(num_words):
+            any_pos[w] |= pos[i, w] & ~assign_false[w]
+            any_neg[w] |= neg[i, w] & ~assign_true[w]
+
+    found = np.empty(num_words * 64, dtype=np.int32)
+    count = 0
+    for w in range(num_words):
+        pure_pos = any_pos[w] & ~any_neg[w]
+        pure_neg = any_neg[w] & ~any_pos[w]
+        for b in range(64):
+            bit = np.uint64(1) << np.uint64(b)
+            if pure_pos & bit:
+                found[count] = w * 64 + b + 1
+                count += 1
+            elif pure_neg & bit:
+                found[count] = -(w * 64 + b + 1)
+                count += 1
+    return found[:count]
@@ -1,14 +1,13 @@
 import argparse
 from collections import defaultdict, deque
 from enum import Flag, auto
-from functools import lru_cache
 import logging
 from trail import CNF, Trail, Literal
+from cdcl_kernels import propagate as propagate_kernel
 import resource
 import time
 from typing import  List, Optional, Set, Tuple, Union
 import random
-import math
 import numpy as np
 
 class SolverOptions(Flag):
@@ -20,34 +19,122 @@ class SolverOptions(Flag):
     CLAUSE_MINIMIZATION = auto()
 
 class VSIDSHeuristic:
-    """Implements the Variable State Independent Decaying Sum (VSIDS) heuristic."""
+    """Implements the Variable State Independent Decaying Sum (VSIDS) heuristic.
+
+    Variables are kept in an indexed max-heap ordered by activity, so a
+    decision is an O(log n) pop instead of a scan over every variable;
+    heap_pos maps a variable to its slot (-1 when not queued) so score
+    bumps can sift the entry in place.
+    """
     def __init__(self):
         self.b = 2
         self.c = 1.05
+        self.order_heap: List[int] = []
+        self.heap_pos: Optional[np.ndarray] = None
+
+    def _prefer(self, trail: Trail, var_a: int, var_b: int) -> bool:
+        """Heap priority: higher activity first, smaller index on ties."""
+        score_a = trail.vsids_score[var_a]
+        score_b = trail.vsids_score[var_b]
+        return score_a > score_b or (score_a == score_b and var_a < var_b)
+
+    def _sift_up(self, trail: Trail, pos: int) -> None:
+        heap = self.order_heap
+        var = heap[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not self._prefer(trail, var, heap[parent]):
+                break
+            heap[pos] = heap[parent]
+            self.heap_pos[heap[pos]] = pos
+            pos = parent
+        heap[pos] = var
+        self.heap_pos[var] = pos
+
+    def _sift_down(self, trail: Trail, pos: int) -> None:
+        heap = self.order_heap
+        var = heap[pos]
+        size = len(heap)
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._prefer(trail, heap[child + 1], heap[child]):
+                child += 1
+            if not self._prefer(trail, heap[child], var):
+                break
+            heap[pos] = heap[child]
+            self.heap_pos[heap[pos]] = pos
+            pos = child
+        heap[pos] = var
+        self.heap_pos[var] = pos
+
+    def _insert(self, trail: Trail, var: int) -> None:
+        if self.heap_pos[var] != -1:
+            return
+        self.order_heap.append(var)
+        self._sift_up(trail, len(self.order_heap) - 1)
+
+    def _pop_top(self, trail: Trail) -> int:
+        heap = self.order_heap
+        top = heap[0]
+        last = heap.pop()
+        self.heap_pos[top] = -1
+        if heap:
+            heap[0] = last
+            self.heap_pos[last] = 0
+            self._sift_down(trail, 0)
+        return top
+
+    def _ensure_heap(self, trail: Trail) -> None:
+        if self.heap_pos is None:
+            self.heap_pos = np.full(trail.num_literals, -1, dtype=np.int64)
+            for var in range(trail.num_literals):
+                self._insert(trail, var)
 
     def decide(self, trail: Trail) -> Literal:
         """Choose the next unassigned variable based on VSIDS scores."""
-        unassigned = [a for a in trail.trail if not a.is_assigned]
-        return max(unassigned, key=lambda a: a.vsids_score).polarity if unassigned else None
+        self._ensure_heap(trail)
+        # Entries of variables assigned by propagation are stale; discard
+        # them on the way, they are re-queued when backtracking unassigns
+        while self.order_heap:
+            var = self._pop_top(trail)
+            if not trail.is_assigned[var]:
+                return int(trail.polarity[var])
+        return None
 
     def update_scores(self, trail: Trail, conflict_literals: Set[Literal]) -> None:
         """Update VSIDS scores for literals involved in conflicts."""
+        self._ensure_heap(trail)
         for literal in conflict_literals:
-            assignment = trail.get_assignment(literal)
-            assignment.vsids_score += self.b
+            var = abs(literal) - 1
+            trail.vsids_score[var] += self.b
+            if self.heap_pos[var] != -1:
+                self._sift_up(trail, self.heap_pos[var])
         self.b *= self.c
 
-        if self.b > 10**30:
-            for assignment in trail.trail:
-                assignment.vsids_score /= self.b
-            self.b = 1
+        if self.b > 1e100:
+            # Rescale only to stave off float overflow — decisions
+            # compare scores, so a uniform in-place scale keeps both
+            # the ordering and the heap intact
+            np.multiply(trail.vsids_score, 1e-100, out=trail.vsids_score)
+            self.b *= 1e-100
+
+    def on_unassign(self, trail: Trail, literals: List[Literal]) -> None:
+        """Re-queue variables released by backtracking."""
+        self._ensure_heap(trail)
+        for literal in literals:
+            self._insert(trail, abs(literal) - 1)
 
 class RandomHeuristic:
     """Implements a random decision heuristic."""
     def decide(self, trail: Trail) -> Literal:
         """Choose a random unassigned variable."""
-        unassigned = [a for a in trail.trail if not a.is_assigned]
-        return random.choice(unassigned).polarity if unassigned else None
+        unassigned = np.flatnonzero(~trail.is_assigned)
+        return int(trail.polarity[random.choice(unassigned)]) if unassigned.size else None
+
+    def on_unassign(self, trail: Trail, literals: List[Literal]) -> None:
+        """Nothing to maintain for random decisions."""
 
 class CDCLSolver:
     """Implements the Conflict-Driven Clause Learning (CDCL) SAT solver."""
@@ -65,6 +152,12 @@ class CDCLSolver:
         self.minimalizations = 0
         self.max_length_learned_clause = 0
         self.restarts = 0
+        self._clause_bitmap: Optional[np.ndarray] = None
+        self._minimize_status: Optional[np.ndarray] = None
+        self.seen: Optional[np.ndarray] = None
+        # Variable count recorded by read_cnf; spares CDCL a full pass
+        # over the formula when the CNF came from a file
+        self._parsed_num_variables: Optional[int] = None
         
         # VSIDS parameters
         self.b = 2
@@ -75,6 +168,7 @@ class CDCLSolver:
         self.luby_num = 100
         self.lbdLimit = 10
         self.lbdFactor = 1.1
+        self._luby_table: List[int] = []
 
     def decide(self, trail: Trail, decision_level: int) -> None:
         """Make a decision on the next variable to assign."""
@@ -82,165 +176,158 @@ class CDCLSolver:
         literal = self.decision_heuristic.decide(trail)
         if literal:
             logging.info(f"Decision at level {decision_level}: {literal}")
+            trail.level_start.append(trail.trail_len)
             trail.set_literal(literal, decision_level, [])
             
-    def find_new_watch(self, clause, trail_history):
-        """Find a new literal to watch in the clause."""
-        return next((j for j in range(2, len(clause)) if -clause[j] not in trail_history), -1)
-
-    def propagate(self, cnf: List[np.ndarray], trail: Trail, decision_level: int) -> Union[np.ndarray, None]:
-        """Perform unit propagation and detect conflicts."""
-        literals_propagate = deque([trail.trail_history[-1]])
-        trail_history = set(trail.trail_history)
-
-        while literals_propagate:
-            literal = -literals_propagate.pop()
-            assignment = trail.get_assignment(literal)
-            watched_clause_indices = assignment.retrieve_watched_clauses(literal)
-
-            i = 0
-            while i < len(watched_clause_indices):
-                clause_index = watched_clause_indices[i]
-                clause = cnf[clause_index]
-
-                if len(clause) < 2:
-                    self.conflicts += 1
-                    return clause
-
-                own_index = 0 if clause[0] == literal else 1
-                other_index = 1 - own_index
-                other_literal = clause[other_index]
-
-                if other_literal in trail:
-                    i += 1
-                    continue
-
-                j = self.find_new_watch(clause, trail_history)
+    def propagate(self, trail: Trail, decision_level: int) -> Union[List[int], None]:
+        """Perform unit propagation and detect conflicts.
 
-                if j != -1:
-                    new_literal = clause[j]
-                    clause[own_index], clause[j] = clause[j], clause[own_index]
-                    assignment.discard_watched_clause(clause_index, literal)
-                    trail.get_assignment(new_literal).append_watched_clause(clause_index, new_literal)
-                    watched_clause_indices.pop(i)
-                else:
-                    if -other_literal in trail:
-                        self.conflicts += 1
-                        return clause
-                    else:
-                        self.unit_propagations += 1
-                        trail.set_literal(other_literal, decision_level, clause)
-                        literals_propagate.append(other_literal)
-                        trail_history.add(other_literal)
-                    i += 1
-
-        return None
+        The fixpoint itself runs in the compiled kernel over the clause
+        arena; this wrapper only records trail history and reasons for
+        the literals the kernel assigned.
+        """
+        implied, reasons, count, conflict_index = propagate_kernel(
+            trail.clause_data, trail.clause_offsets, trail.watch_head,
+            trail.watch_next, trail.watch_blocker, trail.binary_head,
+            trail.binary_next, trail.is_assigned, trail.polarity,
+            trail.decision_level, trail.num_literals,
+            trail.trail_history[trail.trail_len - 1], decision_level)
+
+        self.unit_propagations += count
+        trail.trail_history[trail.trail_len:trail.trail_len + count] = implied[:count]
+        trail.trail_len += count
+        for k in range(count):
+            literal = int(implied[k])
+            start = trail.clause_offsets[reasons[k]]
+            end = trail.clause_offsets[reasons[k] + 1]
+            # Negating copies the slice, so later in-place watch swaps in
+            # the arena cannot corrupt the recorded reason
+            reason_literals = trail.clause_data[start:end]
+            trail.parents[abs(literal) - 1] = \
+                -reason_literals[reason_literals != literal]
+
+        if conflict_index == -1:
+            return None
+        self.conflicts += 1
+        return trail.clause_literals(int(conflict_index))
+
+    def _note_literal(self, trail: Trail, literal: Literal, decision_level: int,
+                      to_clear: List[int], bump: List[Literal],
+                      lower_level_vars: List[Literal]) -> int:
+        """Stamp a literal for the running conflict analysis.
+
+        Returns 1 if the literal is newly seen on the conflicting level
+        so the caller can keep its open-literal counter up to date.
+        """
+        index = abs(literal) - 1
+        if self.seen[index]:
+            return 0
+        self.seen[index] = 1
+        to_clear.append(index)
+        bump.append(literal)
+        if trail.decision_level[index] == decision_level:
+            return 1
+        lower_level_vars.append(literal)
+        return 0
 
     def analyze_conflict(self, trail: Trail, conflict: List[int], decision_level: int) -> Tuple[List[int], int]:
-        """Investigate a conflict and derive a new clause."""
-        lower_level_vars = set()
-        current_level_vars = set()
-        all_vars = set()
+        """Investigate a conflict and derive a new clause.
+
+        Working sets are a MiniSAT-style seen byte array stamped per
+        variable instead of hash sets; only the touched entries are
+        cleared afterwards.
+        """
+        if self.seen is None or self.seen.size != trail.num_literals:
+            self.seen = np.zeros(trail.num_literals, dtype=np.uint8)
+        to_clear: List[int] = []
+        bump: List[Literal] = []
+        lower_level_vars: List[Literal] = []
 
+        open_count = 0
         for var in conflict:
-            assign = trail.get_assignment(var)
-            if assign.decision_level == decision_level:
-                current_level_vars.add(-var)
-            else:
-                lower_level_vars.add((-var, assign.decision_level))
-            all_vars.add(-var)
+            open_count += self._note_literal(trail, -var, decision_level,
+                                             to_clear, bump, lower_level_vars)
 
         investigate = (self._investigate_current_level 
                        if SolverOptions.CLAUSE_LEARNING in self.options 
                        else self._investigate_decision_var)
-        investigate(trail, current_level_vars, lower_level_vars, all_vars, decision_level)
+        pivot = investigate(trail, open_count, decision_level,
+                            to_clear, bump, lower_level_vars)
 
-        pivot = current_level_vars.pop()
-        derived_clause = [-pivot, *(-var for var, _ in lower_level_vars)]
-        backtrack_level = max((level for _, level in lower_level_vars), default=0)
+        derived_clause = [-pivot, *(-var for var in lower_level_vars)]
+        backtrack_level = 0
+        if lower_level_vars:
+            lower = np.abs(np.asarray(lower_level_vars, dtype=np.int32)) - 1
+            backtrack_level = int(trail.decision_level[lower].max())
 
         if SolverOptions.VSIDS in self.options:
-            self.decision_heuristic.update_scores(trail, all_vars)
+            self.decision_heuristic.update_scores(trail, bump)
 
+        self.seen[to_clear] = 0
         self.learned_clauses += 1
         self.max_length_learned_clause = max(self.max_length_learned_clause, len(derived_clause))
         return derived_clause, backtrack_level
 
-    def _investigate_current_level(self, trail: Trail, current_level_vars: Set[int], 
-                                   lower_level_vars: Set[Tuple[int, int]], all_vars: Set[int], decision_level: int) -> None:
+    def _investigate_current_level(self, trail: Trail, open_count: int, decision_level: int,
+                                   to_clear: List[int], bump: List[Literal],
+                                   lower_level_vars: List[Literal]) -> Literal:
         """Investigate the current decision level for unique implication point."""
-        for var in reversed(trail.trail_history):
-            if len(current_level_vars) == 1:
-                break
-            if var not in current_level_vars:
+        seen = self.seen
+        # Everything at the conflicting level sits in one trail segment,
+        # so the walk never has to look at earlier levels
+        segment = trail.trail_history[trail.level_start[decision_level - 1]:trail.trail_len]
+        for var in segment[::-1]:
+            index = abs(var) - 1
+            if not seen[index]:
                 continue
-            antecedents = trail.get_assignment(var).parents
-            for antecedent in antecedents:
-                level = trail.get_assignment(antecedent).decision_level
-                if level == decision_level:
-                    current_level_vars.add(antecedent)
-                else:
-                    lower_level_vars.add((antecedent, level))
-                all_vars.add(antecedent)
-            current_level_vars.remove(var)
-
-    def _investigate_decision_var(self, trail: Trail, current_level_vars: Set[int], 
-                                  lower_level_vars: Set[Tuple[int, int]], all_vars: Set[int], decision_level: int) -> None:
+            if open_count == 1:
+                return var
+            open_count -= 1
+            for antecedent in trail.parents[index]:
+                open_count += self._note_literal(trail, antecedent, decision_level,
+                                                 to_clear, bump, lower_level_vars)
+
+    def _investigate_decision_var(self, trail: Trail, open_count: int, decision_level: int,
+                                  to_clear: List[int], bump: List[Literal],
+                                  lower_level_vars: List[Literal]) -> Literal:
         """Investigate the decision variable for conflict resolution."""
+        seen = self.seen
+        segment = trail.trail_history[trail.level_start[decision_level - 1]:trail.trail_len]
         last_var: Optional[int] = None
-        for var in reversed(trail.trail_history):
-            if trail.get_assignment(var).decision_level != decision_level:
-                break
-            if var not in current_level_vars:
+        for var in segment[::-1]:
+            index = abs(var) - 1
+            if not seen[index]:
                 continue
-            antecedents = trail.get_assignment(var).parents
-            for antecedent in antecedents:
-                assign = trail.get_assignment(antecedent)
-                if assign.decision_level == decision_level:
-                    current_level_vars.add(antecedent)
-                else:
-                    lower_level_vars.add((antecedent, assign.decision_level))
-                all_vars.add(antecedent)
-            current_level_vars.remove(var)
+            for antecedent in trail.parents[index]:
+                self._note_literal(trail, antecedent, decision_level,
+                                   to_clear, bump, lower_level_vars)
             last_var = var
-        if last_var is not None:
-            current_level_vars.add(last_var)
+        return last_var
 
-    @lru_cache(maxsize=1024)
     def luby(self, i: int) -> int:
-        """Compute the i-th term of the Luby sequence."""
-        k = math.floor(math.log(i, 2)) + 1
-        if i == 2**k - 1:
-            return 2**(k-1)
-        return self.luby(i - 2**(k-1) + 1)
-
-    def deleteClause(self, cnf: List[List[int]], trail: Trail, lbd: List[float], i: int) -> None:
-        """Remove a constraint from the formula and update related data structures."""
-        self.deleted_clauses += 1
-
-        target_constraint = cnf[i]
-        for var in target_constraint[:2]:
-            trail.get_assignment(var).discard_watched_clause(i, var)
-
-        if i != len(cnf) - 1:
-            self._swap_and_update(cnf, lbd, trail, i)
-
-        cnf.pop()
-        lbd.pop()
-
-    def _swap_and_update(self, cnf: List[List[int]], lbd: List[float], trail: Trail, index: int) -> None:
-        """Swap the constraint to be deleted with the last one and update watches."""
-        last_index = len(cnf) - 1
-
-        # Swap constraints and LBD values
-        cnf[index], cnf[last_index] = cnf[last_index], cnf[index]
-        lbd[index], lbd[last_index] = lbd[last_index], lbd[index]
+        """Return the i-th term of the Luby sequence from a lazily grown table."""
+        table = self._luby_table
+        while len(table) < i:
+            j = len(table) + 1
+            k = j.bit_length()
+            if j == (1 << k) - 1:
+                table.append(1 << (k - 1))
+            else:
+                table.append(table[j - (1 << (k - 1))])
+        return table[i - 1]
+
+    def delete_clauses(self, trail: Trail, lbd: np.ndarray, oldLength: int) -> None:
+        """Drop learned clauses whose LBD exceeds the limit and compact the arena."""
+        learned = np.arange(oldLength, trail.num_clauses)
+        survivors = learned[lbd[oldLength:trail.num_clauses] <= self.lbdLimit]
+        if survivors.size == learned.size:
+            return
 
-        # Update watched literals
-        for var in cnf[index][:2]:
-            trail.get_assignment(var).replace_watched_clause(last_index, index, var)
+        self.deleted_clauses += learned.size - survivors.size
+        lbd[oldLength:oldLength + survivors.size] = lbd[survivors]
+        trail.remove_clauses(list(range(oldLength)) + survivors.tolist())
 
-    def apply_restart_policy(self, trail: Trail, cnf: List[List[int]], lbd: List[float], oldLength: int, decision_level: int) -> int:
+    def apply_restart_policy(self, trail: Trail, lbd: np.ndarray, oldLength: int, decision_level: int) -> int:
         """Apply the restart policy to the SAT solver."""
         if not SolverOptions.RESTARTS in self.options:
             return decision_level
@@ -253,11 +340,7 @@ class CDCLSolver:
             self.backtrack(trail, 0)
             
             if SolverOptions.CLAUSE_DELETION in self.options:
-                i = len(cnf) - 1
-                while i >= oldLength:
-                    if lbd[i] > self.lbdLimit:
-                        self.deleteClause(cnf, trail, lbd, i)
-                    i -= 1
+                self.delete_clauses(trail, lbd, oldLength)
                 self.lbdLimit *= self.lbdFactor
 
             return 0
@@ -266,65 +349,125 @@ class CDCLSolver:
 
     def backtrack(self, trail: Trail, decision_level: int) -> None:
         """Backtrack to a specified decision level by unassigning literals."""
-        if not trail.trail_history:
+        if trail.trail_len == 0:
             return
 
         cutoff_index = self._find_cutoff_point(trail, decision_level)
 
-        for literal in trail.trail_history[cutoff_index:]:
-            trail.get_assignment(literal).is_assigned = False
+        released = trail.trail_history[cutoff_index:trail.trail_len]
+        if released.size:
+            variables = np.abs(released) - 1
+            trail.is_assigned[variables] = False
+            trail.decision_level[variables] = 0
+        self.decision_heuristic.on_unassign(trail, released)
 
-        trail.trail_history = trail.trail_history[:cutoff_index]
+        trail.trail_len = cutoff_index
+        del trail.level_start[decision_level:]
         
         
     def _find_cutoff_point(self, trail: Trail, target_level: int) -> int:
         """Determine the index where trail should be cut off."""
-        for idx, literal in enumerate(trail.trail_history[::-1]):
-            if trail.get_assignment(literal).decision_level <= target_level:
-                return len(trail.trail_history) - idx
-        return 0
-
-    @lru_cache(maxsize=1024)
-    def check_parents_in_clause(self, parents: tuple, clause_set: frozenset) -> bool:
-        """Check if all parents of a literal are in the clause."""
-        return all(-parent in clause_set for parent in parents)
+        if target_level < len(trail.level_start):
+            return trail.level_start[target_level]
+        return trail.trail_len
+
+    def _literal_redundant(self, trail: Trail, literal: Literal, bitmap: np.ndarray,
+                           status: np.ndarray, touched: List[int]) -> bool:
+        """Decide whether every reason chain of a literal leads back into
+        the learned clause.
+
+        Iterative depth-first walk over the implication graph; verdicts
+        are memoized in status (1 redundant, 2 kept) for the duration of
+        one minimization pass. A chain ending in a decision outside the
+        clause makes the literal — and everything visited — non-redundant.
+        """
+        num_literals = trail.num_literals
+        pending = [literal]
+        visited = [abs(literal) - 1]
+        touched.append(visited[0])
+        verdict = 1
+        while pending:
+            current = pending.pop()
+            for antecedent in trail.parents[abs(current) - 1]:
+                index = abs(antecedent) - 1
+                if (bitmap[num_literals + antecedent]
+                        or bitmap[num_literals - antecedent]
+                        or status[index] == 1):
+                    continue
+                if status[index] == 2 or len(trail.parents[index]) == 0:
+                    verdict = 2
+                    pending.clear()
+                    break
+                # Tentative mark so shared ancestors expand only once
+                status[index] = 1
+                touched.append(index)
+                visited.append(index)
+                pending.append(antecedent)
+        for index in visited:
+            status[index] = verdict
+        return verdict == 1
 
     def minimize_learned_clause(self, learned_clause: List[int], trail: Trail) -> None:
         """Refines the conflict-induced clause by pruning redundant literals."""
         self.minimalizations += 1
 
-        clause_literals = set(learned_clause)
+        # Reusable signed-literal bitmap: slot num_literals + lit marks
+        # membership, so the redundancy test is two array loads per parent
+        num_literals = trail.num_literals
+        if self._clause_bitmap is None or self._clause_bitmap.size != 2 * num_literals + 1:
+            self._clause_bitmap = np.zeros(2 * num_literals + 1, dtype=np.uint8)
+            self._minimize_status = np.zeros(num_literals, dtype=np.uint8)
+        bitmap = self._clause_bitmap
+        status = self._minimize_status
+        members = num_literals + np.asarray(learned_clause, dtype=np.int32)
+        bitmap[members] = 1
+
         simplified_clause = [learned_clause[0]]  # Keep the first literal
+        touched: List[int] = []
 
         for lit in learned_clause[1:]:
-            assignment = trail.get_assignment(lit)
-            if not assignment.parents or any(-p not in clause_literals and p not in clause_literals for p in assignment.parents):
+            index = abs(lit) - 1
+            if status[index] == 0:
+                if len(trail.parents[index]) == 0:
+                    status[index] = 2
+                    touched.append(index)
+                else:
+                    self._literal_redundant(trail, lit, bitmap, status, touched)
+            if status[index] == 2:
                 simplified_clause.append(lit)
 
+        bitmap[members] = 0
+        if touched:
+            status[touched] = 0
         learned_clause[:] = simplified_clause  # In-place update of learned_clause
 
-    def learn_new_clause(self, cnf: List[List[int]], trail: Trail, lbd: List[float], learned_clause: List[int], decision_level: int, proof_cnf: List[List[int]]) -> None:
+    def learn_new_clause(self, trail: Trail, lbd: np.ndarray, learned_clause: List[int], decision_level: int, proof_cnf: List[List[int]]) -> np.ndarray:
         """Integrates a newly derived clause into the formula and updates related data structures."""
         self.learned_clauses += 1
 
         if SolverOptions.CLAUSE_MINIMIZATION in self.options:
             self.minimize_learned_clause(learned_clause, trail)
 
-        cnf.append(learned_clause)
         proof_cnf.append(learned_clause)
 
         self.unit_propagations += 1
 
-        new_clause_index = len(cnf) - 1
-        for lit in learned_clause[:2]:
-            trail.get_assignment(lit).append_watched_clause(new_clause_index, lit)
+        trail.add_clause(learned_clause)
+
+        variables = np.abs(np.asarray(learned_clause, dtype=np.int32)) - 1
+        clause_lbd = np.unique(trail.decision_level[variables]).size
 
-        level_set = set()
-        for lit in learned_clause:
-            level_set.add(trail.get_assignment(lit).decision_level)
-        lbd.append(len(level_set))
+        # lbd is sized to the arena capacity with trail.num_clauses as
+        # its logical length; grow it with the same doubling scheme
+        index = trail.num_clauses - 1
+        if index >= lbd.size:
+            grown = np.zeros(max(2 * lbd.size, index + 1), dtype=lbd.dtype)
+            grown[:lbd.size] = lbd
+            lbd = grown
+        lbd[index] = clause_lbd
 
         trail.set_literal(learned_clause[0], decision_level, learned_clause)
+        return lbd
         
     @staticmethod
     def sign(x):
@@ -347,21 +490,23 @@ class CDCLSolver:
             A tuple indicating the satisfiability of the CNF and either the assignment history or the proof CNF.
         """
         original_cnf_size = len(cnf)
-        num_literals = self.get_count(cnf)
+        num_literals = (self._parsed_num_variables
+                        if self._parsed_num_variables is not None
+                        else self.get_count(cnf))
         proof_cnf = cnf.copy()
     
         # Initialize trail and LBD list
         trail = Trail(num_literals, cnf)
-        lbd: List[float] = [0] * original_cnf_size
+        lbd = np.zeros(max(original_cnf_size, 1), dtype=np.float64)
         decision_level = 0
     
-        while len(trail.trail_history) < num_literals:
+        while trail.trail_len < num_literals:
             # Perform a decision
             decision_level += 1
             self.decide(trail, decision_level)
     
             # Propagate the implications
-            conflict_clause = self.propagate(cnf, trail, decision_level)
+            conflict_clause = self.propagate(trail, decision_level)
     
             # Handle conflicts
             while conflict_clause is not None:
@@ -372,16 +517,16 @@ class CDCLSolver:
                 # Analyze the conflict and learn a new clause
                 learned_clause, decision_level = self.analyze_conflict(trail, conflict_clause, decision_level)
                 self.backtrack(trail, decision_level)
-                self.learn_new_clause(cnf, trail, lbd, learned_clause, decision_level, proof_cnf)
+                lbd = self.learn_new_clause(trail, lbd, learned_clause, decision_level, proof_cnf)
     
                 # Continue propagation after learning a new clause
-                conflict_clause = self.propagate(cnf, trail, decision_level)
+                conflict_clause = self.propagate(trail, decision_level)
     
             # Apply the restart policy if necessary
-            decision_level = self.apply_restart_policy(trail, cnf, lbd, original_cnf_size, decision_level)
+            decision_level = self.apply_restart_policy(trail, lbd, original_cnf_size, decision_level)
     
         # If no conflicts are found, the CNF is satisfiable
-        return True, trail.trail_history
+        return True, trail.trail_history[:trail.trail_len].tolist()
 
     def read_cnf(self, filename: str) -> List[List[int]]:
         """
@@ -393,32 +538,32 @@ class CDCLSolver:
         Returns:
             A list of clauses, where each clause is a list of integers.
         """
-        cnf: List[List[int]] = []
-        vars: Set[int] = set()
-    
         with open(filename, "r") as f:
-            for line in f:
-                # Skip comments and problem line
-                if line.startswith("c") or line.startswith("p"):
-                    continue
-                clause: List[int] = []
-                literals = line.split()
-                for literal in literals:
-                    literal = int(literal)
-                    if literal == 0:
-                        break
-                    vars.add(abs(literal))
-                    clause.append(literal)
-                clause.sort(key=abs)
-                cnf.append(clause)
-    
-        # Map variables to a continuous range 1, 2, ..., n
-        var_map = {var: i + 1 for i, var in enumerate(sorted(vars))}
-    
-        for i, clause in enumerate(cnf):
-            for j, lit in enumerate(clause):
-                cnf[i][j] = self.sign(lit) * var_map[abs(lit)]
-    
+            text = "".join(line for line in f
+                           if not line.startswith(("c", "p")))
+
+        # One vectorized scan converts every literal; clauses are the
+        # runs between the 0 sentinels
+        literals = np.fromstring(text, dtype=np.int32, sep=" ")
+
+        # Map variables to a continuous range 1, 2, ..., n; the count
+        # is a byproduct of the remap, so CDCL need not rescan the CNF
+        variables = np.unique(np.abs(literals))
+        variables = variables[variables != 0]
+        self._parsed_num_variables = int(variables.size)
+        remap = np.zeros(int(variables[-1]) + 1 if variables.size else 1,
+                         dtype=np.int32)
+        remap[variables] = np.arange(1, variables.size + 1, dtype=np.int32)
+        literals = np.sign(literals) * remap[np.abs(literals)]
+
+        cnf: List[List[int]] = []
+        for chunk in np.split(literals, np.flatnonzero(literals == 0) + 1):
+            if chunk.size == 0:
+                continue
+            clause = chunk[:-1] if chunk[-1] == 0 else chunk
+            clause = clause[np.argsort(np.abs(clause), kind="stable")]
+            cnf.append(clause.tolist())
+
         return cnf
 
 if __name__ == "__main__":
@@ -429,6 +574,7 @@ if __name__ == "__main__":
     parser.add_argument('--learn', '-l', action='store_true', help='Enable Clause Learning')
     parser.add_argument('--delete', '-d', action='store_true', help='Enable Clause Deletion')
     parser.add_argument('--minimize', '-m', action='store_true', help='Enable Clause Minimalization')
+    parser.add_argument('--proof', '-p', default='unsat.drat', help="DRAT proof output file name, or '-' for stdout (default: unsat.drat)")
                         
     args = parser.parse_args()
 
@@ -453,9 +599,13 @@ if __name__ == "__main__":
     stat_peak_memory_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
     
     if not sat:
-        with open("unsat.drat", "w") as f:
+        if args.proof == "-":
             for clause in trail:
-                f.write(" ".join(map(str, clause)) + " 0" + "\n")
+                print(" ".join(map(str, clause)) + " 0")
+        else:
+            with open(args.proof, "w") as f:
+                for clause in trail:
+                    f.write(" ".join(map(str, clause)) + " 0" + "\n")
 
     print("s", "SATISFIABLE" if sat else "UNSATISFIABLE")
     print("c Time:", stat_time_end - stat_time_start)
@@ -0,0 +1,136 @@
+"""Numba-compiled kernels for the CDCL solver.
+
+Clauses live in a flat int32 arena with an offsets table (clause i
+spans data[offsets[i]:offsets[i+1]]). Watches are intrusive linked
+lists over that arena: every clause owns two watch nodes, node
+2*i + slot watches the literal at data[offsets[i] + slot], watch_head
+is indexed by (tier, literal + num_literals) and watch_next chains the
+nodes. Tier 0 holds short (core) clauses and is scanned before tier 1,
+so cheap, high-quality propagations come first. This lets the whole BCP
+fixpoint run as machine code without touching Python objects.
+"""
+from numba import njit
+import numpy as np
+
+
+@njit(cache=True)
+def propagate(clause_data, clause_offsets, watch_head, watch_next,
+              watch_blocker, binary_head, binary_next, is_assigned,
+              polarity, decision_levels, num_literals, start_literal,
+              level):
+    """
+    Run unit propagation from a freshly assigned literal to fixpoint.
+
+    Implied literals are assigned directly into the arrays and reported
+    together with the index of their implying clause so the caller can
+    record trail history and reasons.
+
+    Returns:
+        (implied literals, implying clause indices, count,
+        conflict clause index or -1).
+    """
+    implied = np.empty(num_literals, dtype=np.int32)
+    reasons = np.empty(num_literals, dtype=np.int32)
+    count = 0
+    pending = np.empty(num_literals + 1, dtype=np.int32)
+    pending[0] = start_literal
+    pending_len = 1
+
+    while pending_len > 0:
+        pending_len -= 1
+        false_literal = -pending[pending_len]
+        head_slot = false_literal + num_literals
+
+        # Binary clauses propagate straight off their implication list:
+        # the falsified literal's partner must hold, no watch movement
+        node = binary_head[head_slot]
+        while node != -1:
+            clause_index = node >> 1
+            start = clause_offsets[clause_index]
+            other = clause_data[start + (1 - (node & 1))]
+            other_var = abs(other) - 1
+            if is_assigned[other_var]:
+                if polarity[other_var] != other:
+                    return implied, reasons, count, clause_index
+            else:
+                is_assigned[other_var] = True
+                polarity[other_var] = other
+                decision_levels[other_var] = level
+                implied[count] = other
+                reasons[count] = clause_index
+                count += 1
+                pending[pending_len] = other
+                pending_len += 1
+            node = binary_next[node]
+
+        # Core (short) clauses first, then the long tier; a moved watch
+        # stays in its clause's tier
+        for tier in range(2):
+            node = watch_head[tier, head_slot]
+            prev = -1
+            while node != -1:
+                # A true blocking literal satisfies the clause without
+                # touching its arena memory at all
+                blocker = watch_blocker[node]
+                blocker_var = abs(blocker) - 1
+                if is_assigned[blocker_var] and polarity[blocker_var] == blocker:
+                    prev = node
+                    node = watch_next[node]
+                    continue
+
+                clause_index = node >> 1
+                slot = node & 1
+                start = clause_offsets[clause_index]
+                end = clause_offsets[clause_index + 1]
+
+                if end - start < 2:
+                    return implied, reasons, count, clause_index
+
+                other = clause_data[start + (1 - slot)]
+                other_var = abs(other) - 1
+                if is_assigned[other_var] and polarity[other_var] == other:
+                    watch_blocker[node] = other
+                    prev = node
+                    node = watch_next[node]
+                    continue
+
+                # Look for a non-false literal to watch instead
+                new_watch = -1
+                for k in range(start + 2, end):
+                    candidate = clause_data[k]
+                    var = abs(candidate) - 1
+                    if not (is_assigned[var] and polarity[var] == -candidate):
+                        new_watch = k
+                        break
+
+                if new_watch != -1:
+                    watched_pos = start + slot
+                    moved = clause_data[new_watch]
+                    clause_data[new_watch] = clause_data[watched_pos]
+                    clause_data[watched_pos] = moved
+                    # Unlink the node here and push it onto the new literal
+                    next_node = watch_next[node]
+                    if prev == -1:
+                        watch_head[tier, head_slot] = next_node
+                    else:
+                        watch_next[prev] = next_node
+                    new_head_slot = moved + num_literals
+                    watch_next[node] = watch_head[tier, new_head_slot]
+                    watch_head[tier, new_head_slot] = node
+                    node = next_node
+                else:
+                    if is_assigned[other_var]:
+                        # The other watch is false as well: conflict
+                        return implied, reasons, count, clause_index
+                    is_assigned[other_var] = True
+                    polarity[other_var] = other
+                    decision_levels[other_var] = level
+                    implied[count] = other
+                    reasons[count] = clause_index
+                    count += 1
+                    pending[pending_len] = other
+                    pending_len += 1
+                    prev = node
+                    node = watch_next[node]
+
+    return implied, reasons, count, -1
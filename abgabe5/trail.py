@@ -1,7 +1,9 @@
-from typing import List, Union, NamedTuple
+from typing import List
 from dataclasses import dataclass, field
 from enum import IntEnum
 
+import numpy as np
+
 # Type aliases for better readability
 Literal = int
 Clause = List[Literal]
@@ -10,85 +12,206 @@ CNF = List[Clause]
 class DecisionLevel(IntEnum):
     UNASSIGNED = 0
 
-@dataclass
-class Assignment:
-    literal: Literal
-    is_assigned: bool = False
-    polarity: Literal = field(init=False)
-    decision_level: DecisionLevel = DecisionLevel.UNASSIGNED
-    parents: List[Literal] = field(default_factory=list)
-    vsids_score: float = 0.0
-    watched_literals: List[int] = field(default_factory=list)
-    watched_neg_literals: List[int] = field(default_factory=list)
-
-    def __post_init__(self):
-        # Set the polarity as the negation of the literal
-        self.polarity = -self.literal
-        
-    def modify_watched_clauses(self, operation: str, *args):
-        # Helper method to modify watched clauses based on the operation
-        attribute = 'watched_literals' if args[0] > 0 else 'watched_neg_literals'
-        current_list = getattr(self, attribute)
-        
-        operations = {
-            'discard': lambda clause_index: [c for c in current_list if c != clause_index],
-            'replace': lambda old_index, new_index: [new_index if c == old_index else c for c in current_list]
-        }
-        
-        new_list = operations[operation](*args[1:])
-        setattr(self, attribute, new_list)
-
-    def discard_watched_clause(self, clause_index: int, polarity: Literal) -> None:
-        # Remove a watched clause from the appropriate list
-        self.modify_watched_clauses('discard', polarity, clause_index)
-
-    def replace_watched_clause(self, old_index: int, new_index: int, polarity: Literal) -> None:
-        # Replace a watched clause with a new one in the appropriate list
-        self.modify_watched_clauses('replace', polarity, old_index, new_index)
-
-    def retrieve_watched_clauses(self, polarity: Literal) -> List[int]:
-        # Return the appropriate list of watched clauses based on polarity
-        return self.watched_literals if polarity > 0 else self.watched_neg_literals
-
-    def append_watched_clause(self, clause_index: int, polarity: Literal) -> None:
-        # Add a new watched clause to the appropriate list
-        self.retrieve_watched_clauses(polarity).append(clause_index)
+# Clauses up to this many literals go on the core watch tier, which is
+# scanned first during propagation: short clauses propagate more often
+# and produce shorter reasons, so visiting them early pays off
+CORE_LENGTH = 7
 
 @dataclass
 class Trail:
+    """Struct-of-arrays assignment state plus the clause arena.
+
+    Per-variable data lives in parallel arrays indexed by abs(literal)-1
+    instead of one Assignment object per variable, so the hot lookups are
+    plain index arithmetic rather than attribute chases. Clauses live in
+    a flat int32 arena with an offsets table, and watches are intrusive
+    linked lists over it: clause i owns watch nodes 2*i and 2*i+1, node
+    2*i + slot watches the literal at arena position offsets[i] + slot.
+    Watch lists come in two tiers scanned core-first during propagation:
+    short clauses (CORE_LENGTH literals or fewer, which includes most
+    useful learned clauses) on row 0, long ones on row 1. That layout is
+    what the compiled propagation kernel operates on.
+    """
     num_literals: int
     cnf: CNF
-    trail_history: List[Literal] = field(default_factory=list)
-    trail: List[Assignment] = field(init=False)
+    # Preallocated assignment trail: at most one entry per variable, so
+    # trail_history never grows and backtracking is a length decrement
+    trail_history: np.ndarray = field(init=False)
+    trail_len: int = field(init=False, default=0)
+    # level_start[k] is the trail index of the first literal at level k+1
+    level_start: List[int] = field(default_factory=list)
+    is_assigned: np.ndarray = field(init=False)
+    polarity: np.ndarray = field(init=False)
+    decision_level: np.ndarray = field(init=False)
+    vsids_score: np.ndarray = field(init=False)
+    parents: List[np.ndarray] = field(init=False)
+    clause_data: np.ndarray = field(init=False)
+    clause_offsets: np.ndarray = field(init=False)
+    num_clauses: int = field(init=False)
+    data_len: int = field(init=False)
+    watch_head: np.ndarray = field(init=False)
+    watch_next: np.ndarray = field(init=False)
+    watch_blocker: np.ndarray = field(init=False)
+    binary_head: np.ndarray = field(init=False)
+    binary_next: np.ndarray = field(init=False)
 
     def __post_init__(self):
-        # Initialize assignments for all literals
-        self.trail = [Assignment(i + 1) for i in range(self.num_literals)]
-        
-        # Set up initial watched literals for each clause
+        num_literals = self.num_literals
+        self.trail_history = np.empty(num_literals, dtype=np.int32)
+        self.is_assigned = np.zeros(num_literals, dtype=bool)
+        # The polarity a variable would take when decided; starts negative
+        # and keeps the last assigned polarity afterwards
+        self.polarity = -np.arange(1, num_literals + 1, dtype=np.int32)
+        self.decision_level = np.zeros(num_literals, dtype=np.int32)
+        self.vsids_score = np.zeros(num_literals, dtype=np.float64)
+        empty = np.empty(0, dtype=np.int32)
+        self.parents = [empty] * num_literals
+
+        # Build the clause arena and the initial watch lists
+        self.num_clauses = len(self.cnf)
+        lengths = np.fromiter((len(clause) for clause in self.cnf),
+                              dtype=np.int32, count=self.num_clauses)
+        self.data_len = int(lengths.sum())
+        self.clause_offsets = np.zeros(self.num_clauses + 1, dtype=np.int32)
+        np.cumsum(lengths, out=self.clause_offsets[1:])
+        self.clause_data = np.fromiter(
+            (literal for clause in self.cnf for literal in clause),
+            dtype=np.int32, count=self.data_len)
+        self.watch_head = np.full((2, 2 * num_literals + 1), -1, dtype=np.int32)
+        self.watch_next = np.full(max(2 * self.num_clauses, 2), -1, dtype=np.int32)
+        self.watch_blocker = np.zeros(max(2 * self.num_clauses, 2), dtype=np.int32)
+        # Binary clauses live on their own implication lists: falsifying
+        # one literal implies the other with no watch movement at all
+        self.binary_head = np.full(2 * num_literals + 1, -1, dtype=np.int32)
+        self.binary_next = np.full(max(2 * self.num_clauses, 2), -1, dtype=np.int32)
         for i, clause in enumerate(self.cnf):
-            for j in range(min(2, len(clause))):
-                self.get_assignment(clause[j]).append_watched_clause(i, clause[j])
-                
+            self._watch_clause(i, clause)
+
+    def watch_index(self, literal: Literal) -> int:
+        # Map a signed literal to its slot in the watch table
+        return literal + self.num_literals
+
+    def _link_watch(self, node: int, literal: Literal, tier: int) -> None:
+        # Push a watch node onto the head of the literal's list in the
+        # given tier (0 core, 1 rest)
+        head_slot = self.watch_index(literal)
+        self.watch_next[node] = self.watch_head[tier, head_slot]
+        self.watch_head[tier, head_slot] = node
+
+    def _link_binary(self, node: int, literal: Literal) -> None:
+        # Push a binary implication node onto the literal's list
+        head_slot = self.watch_index(literal)
+        self.binary_next[node] = self.binary_head[head_slot]
+        self.binary_head[head_slot] = node
+
+    def _watch_clause(self, index: int, clause) -> None:
+        # Route a clause to the binary implication lists or the generic
+        # watch lists depending on its length
+        length = len(clause)
+        if length == 2:
+            self._link_binary(2 * index, clause[0])
+            self._link_binary(2 * index + 1, clause[1])
+            return
+        tier = 0 if length <= CORE_LENGTH else 1
+        for slot in range(min(2, length)):
+            self._link_watch(2 * index + slot, clause[slot], tier)
+            self.watch_blocker[2 * index + slot] = clause[min(1 - slot, length - 1)]
+
+    def clause_literals(self, clause_index: int) -> Clause:
+        # Materialize a clause from the arena as a list of Python ints
+        start = self.clause_offsets[clause_index]
+        end = self.clause_offsets[clause_index + 1]
+        return self.clause_data[start:end].tolist()
+
+    def add_clause(self, clause: Clause) -> None:
+        # Append a learned clause to the arena (amortized doubling) and
+        # watch its first two literals
+        index = self.num_clauses
+        length = len(clause)
+
+        if self.data_len + length > self.clause_data.size:
+            grown = np.empty(max(2 * self.clause_data.size,
+                                 self.data_len + length), dtype=np.int32)
+            grown[:self.data_len] = self.clause_data[:self.data_len]
+            self.clause_data = grown
+        self.clause_data[self.data_len:self.data_len + length] = clause
+        self.data_len += length
+
+        if index + 2 > self.clause_offsets.size:
+            grown = np.zeros(max(2 * self.clause_offsets.size, index + 2),
+                             dtype=np.int32)
+            grown[:index + 1] = self.clause_offsets[:index + 1]
+            self.clause_offsets = grown
+        self.clause_offsets[index + 1] = self.data_len
+
+        if 2 * (index + 1) > self.watch_next.size:
+            grown = np.full(max(2 * self.watch_next.size, 2 * (index + 1)),
+                            -1, dtype=np.int32)
+            grown[:self.watch_next.size] = self.watch_next
+            self.watch_next = grown
+            grown_blockers = np.zeros(self.watch_next.size, dtype=np.int32)
+            grown_blockers[:self.watch_blocker.size] = self.watch_blocker
+            self.watch_blocker = grown_blockers
+            grown_binary = np.full(self.watch_next.size, -1, dtype=np.int32)
+            grown_binary[:self.binary_next.size] = self.binary_next
+            self.binary_next = grown_binary
+
+        self.num_clauses = index + 1
+        self._watch_clause(index, clause)
+
+    def remove_clauses(self, keep_indices: List[int]) -> None:
+        # Compact the arena to the given clauses. Literal order is
+        # preserved, so arena slots 0/1 stay the currently watched
+        # literals and the watch invariants survive the compaction.
+        old_data = self.clause_data
+        old_offsets = self.clause_offsets
+
+        # Deletion only ever drops learned clauses, so keep_indices
+        # starts with the untouched original region — copy that block
+        # wholesale and slice per clause only for the learned survivors
+        prefix = 0
+        while prefix < len(keep_indices) and keep_indices[prefix] == prefix:
+            prefix += 1
+
+        offsets = np.zeros(len(keep_indices) + 1, dtype=np.int32)
+        offsets[:prefix + 1] = old_offsets[:prefix + 1]
+        pieces = [old_data[:old_offsets[prefix]]]
+        for new_index, old_index in enumerate(keep_indices[prefix:], prefix):
+            piece = old_data[old_offsets[old_index]:old_offsets[old_index + 1]]
+            offsets[new_index + 1] = offsets[new_index] + piece.size
+            pieces.append(piece)
+
+        self.num_clauses = len(keep_indices)
+        self.data_len = int(offsets[-1])
+        self.clause_data = (np.concatenate(pieces) if pieces
+                            else np.empty(0, dtype=np.int32))
+        self.clause_offsets = offsets
+        self.watch_head.fill(-1)
+        self.watch_next = np.full(max(2 * self.num_clauses, 2), -1,
+                                  dtype=np.int32)
+        self.watch_blocker = np.zeros(max(2 * self.num_clauses, 2), dtype=np.int32)
+        self.binary_head.fill(-1)
+        self.binary_next = np.full(max(2 * self.num_clauses, 2), -1,
+                                   dtype=np.int32)
+        for i in range(self.num_clauses):
+            start = offsets[i]
+            end = offsets[i + 1]
+            self._watch_clause(i, self.clause_data[start:end])
+
     def __contains__(self, literal: Literal) -> bool:
         # Check if a literal is currently assigned with the given polarity
-        assignment = self.get_assignment(literal)
-        return assignment.is_assigned and assignment.polarity == literal
-                
+        var = abs(literal) - 1
+        return bool(self.is_assigned[var]) and self.polarity[var] == literal
+
     def set_literal(self, literal: Literal, level: DecisionLevel, implying_clause: Clause) -> None:
         # Assign a literal at a given decision level
-        assignment = self.get_assignment(literal)
-        assignment.is_assigned = True
-        assignment.polarity = literal
-        assignment.decision_level = level
-        # Set the parents (reasons) for this assignment
-        assignment.parents = [-lit for lit in implying_clause if lit != literal]
+        var = abs(literal) - 1
+        self.is_assigned[var] = True
+        self.polarity[var] = literal
+        self.decision_level[var] = level
+        # Set the parents (reasons) for this assignment, pre-negated
+        implied_by = np.asarray(implying_clause, dtype=np.int32)
+        self.parents[var] = -implied_by[implied_by != literal]
         # Add this assignment to the history
-        self.trail_history.append(literal)
-
-    def get_assignment(self, literal: Literal) -> Assignment:
-        # Retrieve the Assignment object for a given literal
-        return self.trail[abs(literal) - 1]
-
-
-
+        self.trail_history[self.trail_len] = literal
+        self.trail_len += 1
@@ -1,17 +1,71 @@
-import subprocess
 import argparse
-import sys
-import time
+import concurrent.futures
+import contextlib
+import io
 import os
 import re
+import runpy
+import sys
+import time
+import traceback
+
+
+regex = re.compile(r"(c [a-zA-Z ]+:)")
+
+
+def run_script(script_path, argv):
+    """Execute a repo script in-process as if it were its own python3
+    invocation, capturing stdout/stderr and the exit code.
+
+    Skipping the interpreter spawn (and re-importing numpy/numba per
+    run) is what makes the small instances cheap; module caches warm
+    up once per worker process and are reused across trials.
+    """
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    saved_argv = sys.argv
+    sys.argv = [script_path] + argv
+    # python3 <script> puts the script's directory on sys.path; mirror
+    # that so sibling imports (e.g. cdcl.py's trail) keep resolving
+    script_dir = os.path.dirname(os.path.abspath(script_path))
+    sys.path.insert(0, script_dir)
+    returncode = 0
+    try:
+        with contextlib.redirect_stdout(stdout_buffer), \
+                contextlib.redirect_stderr(stderr_buffer):
+            try:
+                runpy.run_path(script_path, run_name="__main__")
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    returncode = e.code
+                elif e.code is not None:
+                    returncode = 1
+            except Exception:
+                traceback.print_exc(file=stderr_buffer)
+                returncode = 1
+    finally:
+        sys.argv = saved_argv
+        sys.path.remove(script_dir)
+    return returncode, stdout_buffer.getvalue(), stderr_buffer.getvalue()
 
 
-def run_solver(solver_path, flags):
+def generate_cnf(generator, gen_path, n, cnf_path):
+    if generator == "Random":
+        run_script(gen_path, [str(n), str(round(4.0 * n)), "3", "-o", cnf_path])
+    elif generator == "PHP":
+        run_script(gen_path, [str(n), "-o", cnf_path])
+    elif generator == "Pebbling":
+        run_script(gen_path, [str(n), "-o", cnf_path])
+    else:
+        print("Invalid generator")
+        sys.exit(1)
+
+
+def run_solver(solver_path, flags, cnf_path):
     start_time = time.time()
-    process = subprocess.run(['python3', solver_path, "--input", "output.cnf"] + flags, 
-                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    returncode, stdout, stderr = run_script(solver_path, ["--input", cnf_path] + flags)
     end_time = time.time()
-    return process.returncode, process.stdout, process.stderr, end_time - start_time
+    return returncode, stdout, stderr, end_time - start_time
 
 def aggregate_statistics(file, regex):
     stats_sum = {}
@@ -32,13 +86,48 @@ def aggregate_statistics(file, regex):
         return {}, {}
     return stats_sum, stats_count
 
+
+def run_trial(task):
+    """Run one solver invocation and return the aggregated statistics.
+
+    Deterministic instances arrive as a pre-generated shared CNF path;
+    Random trials generate a fresh CNF into a trial-private file.
+    """
+    (generator, gen_path, n, run_path, flags,
+     folder_name, result_name, label, i, tries, shared_cnf) = task
+
+    if shared_cnf is not None:
+        cnf_path = shared_cnf
+    else:
+        cnf_path = f"{folder_name}/input_{i}.cnf"
+        generate_cnf(generator, gen_path, n, cnf_path)
+    result, stdout, stderr, timeSolver = run_solver(run_path, flags, cnf_path)
+    if shared_cnf is None:
+        os.remove(cnf_path)
+
+    result_path = f"{folder_name}/{result_name}_{i}.txt"
+    with open(result_path, "w") as f:
+        f.write(f"Run {i + 1} of {tries}\n")
+        f.write(f"{label}\n")
+        f.write(f"Solver exit code: {result}\n")
+        f.write(f"Execution time: {timeSolver:.2f} seconds\n")
+        f.write(f"Standard Output:\n{stdout}\n")
+        f.write(f"Standard Error:\n{stderr}\n")
+
+    with open(result_path, "r") as file:
+        run_stats_sum, run_stats_count = aggregate_statistics(file, regex)
+    return run_stats_sum, run_stats_count, timeSolver
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Run custom solver with a CNF file')
     parser.add_argument('--tries', '-t', type=int, default=10, help='Number of tries per configuration for Random generator (default: 10)')
+    parser.add_argument('--jobs', '-j', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help='Number of benchmark runs to execute in parallel (default: half the cores)')
     args = parser.parse_args()
 
     solvers = {
-        
+
         'dp': []   ,
         'cdcl': [
             ('--vsids', 'VSIDS Heuristic'),
@@ -51,7 +140,7 @@ if __name__ == "__main__":
             ('--pure', 'Pure Literal Elimination')
         ],
     }
-    
+
     nsolvers = {
         'dp': {
             'Random': [4, 8, 16, 20],
@@ -66,7 +155,7 @@ if __name__ == "__main__":
             'PHP': [1, 2, 3, 4, 5, 6, ],
             'Pebbling': [2, 3, 4, 5, 6]
         },
-        
+
     }
 
     generators = {
@@ -74,125 +163,110 @@ if __name__ == "__main__":
         'PHP': 'gens/php.py',
         'Pebbling': 'gens/pebbling.py'
     }
-    
+
     run_path_dic = {
-        
+
         'dp': 'abgabe3/dp.py',
         'cdcl': 'abgabe5/cdcl.py',
         'dpll': 'abgabe4/dpll.py',
     }
 
-    regex = re.compile(r"(c [a-zA-Z ]+:)")
+    # PHP and Pebbling instances are deterministic in n, so one CNF per
+    # (generator, n) serves every flag configuration and solver in the
+    # sweep; only Random trials need a fresh sample per run
+    shared_cnfs = {}
+    os.makedirs("temp/cache", exist_ok=True)
+    for solver, solver_generators in nsolvers.items():
+        for generator, n_values in solver_generators.items():
+            for n in n_values:
+                if generator == "Random" or (generator, n) in shared_cnfs:
+                    continue
+                cnf_path = f"temp/cache/{generator}_{n}.cnf"
+                generate_cnf(generator, generators[generator], n, cnf_path)
+                shared_cnfs[(generator, n)] = cnf_path
 
+    # Every (configuration, try) pair is independent: collect them all
+    # up front, each with a trial-private CNF path, and fan them out
+    # over a process pool. Averages are written once a configuration's
+    # trials have all come back.
+    configurations = []
     for solver, solver_generators in nsolvers.items():
         run_path = run_path_dic[solver]
-        for generator, n_values in solver_generators.items(): 
+        all_flags = [flag[0] for flag in solvers[solver]]
+        for generator, n_values in solver_generators.items():
             gen_path = generators[generator]
             for n in n_values:
-                folder_name = f"temp/{solver}_{generator}_{n}_all_flags_enabled"
-                os.makedirs(folder_name, exist_ok=True)
-
-                print(f"Running benchmark for solver: {solver}, generator: {generator}, n: {n}, all flags enabled")
-
-                # Run with all flags enabled
-                flags = [flag[0] for flag in solvers[solver]]
-                stats_sum_enabled = {}
-                stats_count_enabled = {}
-                total_time_enabled = 0
-
                 tries = args.tries if generator == "Random" else 1
+                shared_cnf = shared_cnfs.get((generator, n))
 
-                for i in range(tries):
-                    if generator == "Random":
-                        subprocess.run(['python3', gen_path, str(n), str(round(4.0 * n)), "3"], stdout=subprocess.DEVNULL)
-                    elif generator == "PHP":
-                        subprocess.run(['python3', gen_path, str(n)], stdout=subprocess.DEVNULL)
-                    elif generator == "Pebbling":
-                        subprocess.run(['python3', gen_path, str(n)], stdout=subprocess.DEVNULL)
-                    else:
-                        print("Invalid generator")
-                        sys.exit(1)
-
-                    result, stdout, stderr, timeSolver = run_solver(run_path, flags)
-                    total_time_enabled += timeSolver
-                    
-
-                    with open(f"{folder_name}/result_all_flags_enabled_{i}.txt", "w") as f:
-                        f.write(f"Run {i + 1} of {tries}\n")
-                        f.write(f"All flags enabled\n")
-                        f.write(f"Solver exit code: {result}\n")
-                        f.write(f"Execution time: {timeSolver:.2f} seconds\n")
-                        f.write(f"Standard Output:\n{stdout}\n")
-                        f.write(f"Standard Error:\n{stderr}\n")
-
-                    with open(f"{folder_name}/result_all_flags_enabled_{i}.txt", "r") as file:
-                        run_stats_sum, run_stats_count = aggregate_statistics(file, regex)
-                        for stat in run_stats_sum:
-                            stats_sum_enabled[stat] = stats_sum_enabled.get(stat, 0) + run_stats_sum[stat]
-                            stats_count_enabled[stat] = stats_count_enabled.get(stat, 0) + run_stats_count[stat]
-
-
-                avg_stats_enabled = {stat: stats_sum_enabled[stat] / stats_count_enabled[stat] for stat in stats_sum_enabled}
-                average_time_enabled = total_time_enabled / tries
-
-                with open(f"{folder_name}/average_results_all_flags_enabled.txt", "w") as f:
-                    f.write(f"Average results over {tries} runs:\n")
-                    f.write(f"All flags enabled\n")
-                    f.write(f"Total Execution time: {total_time_enabled:.2f} seconds\n")
-                    f.write(f"Average Time: {average_time_enabled:.2f} seconds\n")
-                    for stat in avg_stats_enabled:
-                        f.write(f"Average {stat}: {avg_stats_enabled[stat]:.2f}\n")
+                folder_name = f"temp/{solver}_{generator}_{n}_all_flags_enabled"
+                print(f"Running benchmark for solver: {solver}, generator: {generator}, n: {n}, all flags enabled")
+                configurations.append({
+                    'folder': folder_name,
+                    'average_name': "average_results_all_flags_enabled.txt",
+                    'label': "All flags enabled",
+                    'with_average_time': True,
+                    'tries': tries,
+                    'tasks': [(generator, gen_path, n, run_path, all_flags,
+                               folder_name, "result_all_flags_enabled", "All flags enabled", i, tries, shared_cnf)
+                              for i in range(tries)],
+                })
 
                 for flag, flag_desc in solvers[solver]:
                     flag_str = flag[2:]  # Remove '--' from flag for file naming
                     folder_name = f"temp/{solver}_{generator}_{n}_{flag_str}_off" if flag_str else f"temp/{solver}_{generator}_{n}_default_off"
-                    os.makedirs(folder_name, exist_ok=True)
+                    print(f"Running benchmark for solver: {solver}, generator: {generator}, n: {n}, flag off: {flag_desc}")
+                    configurations.append({
+                        'folder': folder_name,
+                        'average_name': f"average_results_{flag_str}_off.txt",
+                        'label': f"Flag '{flag_desc}' disabled",
+                        'with_average_time': False,
+                        'tries': tries,
+                        'tasks': [(generator, gen_path, n, run_path, [f for f in all_flags if f != flag],
+                                   folder_name, f"result_{flag_str}_off_disabled", f"Flag '{flag_desc}' disabled", i, tries, shared_cnf)
+                                  for i in range(tries)],
+                    })
 
-                    total_time_disabled = 0
-                    stats_sum_disabled = {}
-                    stats_count_disabled = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        for config in configurations:
+            os.makedirs(config['folder'], exist_ok=True)
 
-                    print(f"Running benchmark for solver: {solver}, generator: {generator}, n: {n}, flag off: {flag_desc}")
+        # Submit the largest instances first (longest-processing-time
+        # order): workers pull tasks as they free up, so this keeps a
+        # big run from starting last and serializing the tail of the
+        # sweep. Averages are still aggregated per configuration below.
+        indexed_tasks = [(task, index)
+                         for index, config in enumerate(configurations)
+                         for task in config['tasks']]
+        indexed_tasks.sort(key=lambda pair: pair[0][2], reverse=True)
+        pending = [[] for _ in configurations]
+        for task, index in indexed_tasks:
+            pending[index].append(executor.submit(run_trial, task))
+
+        for config, futures in zip(configurations, pending):
+            stats_sum = {}
+            stats_count = {}
+            total_time = 0
+            for future in futures:
+                run_stats_sum, run_stats_count, timeSolver = future.result()
+                total_time += timeSolver
+                for stat in run_stats_sum:
+                    stats_sum[stat] = stats_sum.get(stat, 0) + run_stats_sum[stat]
+                    stats_count[stat] = stats_count.get(stat, 0) + run_stats_count[stat]
+
+            avg_stats = {stat: stats_sum[stat] / stats_count[stat] for stat in stats_sum}
+            tries = config['tries']
+
+            with open(f"{config['folder']}/{config['average_name']}", "w") as f:
+                f.write(f"Average results over {tries} runs:\n")
+                f.write(f"{config['label']}\n")
+                f.write(f"Total Execution time: {total_time:.2f} seconds\n")
+                if config['with_average_time']:
+                    f.write(f"Average Time: {total_time / tries:.2f} seconds\n")
+                for stat in avg_stats:
+                    f.write(f"Average {stat}: {avg_stats[stat]:.2f}\n")
+
+    for cnf_path in shared_cnfs.values():
+        os.remove(cnf_path)
 
-                    tries = args.tries if generator == "Random" else 1
-
-                    for i in range(tries):
-                        if generator == "Random":
-                            subprocess.run(['python3', gen_path, str(n), str(round(4.0 * n)), "3"], stdout=subprocess.DEVNULL)
-                        elif generator == "PHP":
-                            subprocess.run(['python3', gen_path, str(n)], stdout=subprocess.DEVNULL)
-                        elif generator == "Pebbling":
-                            subprocess.run(['python3', gen_path, str(n)], stdout=subprocess.DEVNULL)
-                        else:
-                            print("Invalid generator")
-                            sys.exit(1)
-
-                        # Run with the flag disabled
-                        result, stdout, stderr, timeSolver = run_solver(run_path, [f for f in flags if f != flag])
-                        total_time_disabled += timeSolver
-
-                        with open(f"{folder_name}/result_{flag_str}_off_disabled_{i}.txt", "w") as f:
-                            f.write(f"Run {i + 1} of {tries}\n")
-                            f.write(f"Flag '{flag_desc}' disabled\n")
-                            f.write(f"Solver exit code: {result}\n")
-                            f.write(f"Execution time: {timeSolver:.2f} seconds\n")
-                            f.write(f"Standard Output:\n{stdout}\n")
-                            f.write(f"Standard Error:\n{stderr}\n")
-
-                        with open(f"{folder_name}/result_{flag_str}_off_disabled_{i}.txt", "r") as file:
-                            run_stats_sum, run_stats_count = aggregate_statistics(file, regex)
-                            for stat in run_stats_sum:
-                                stats_sum_disabled[stat] = stats_sum_disabled.get(stat, 0) + run_stats_sum[stat]
-                                stats_count_disabled[stat] = stats_count_disabled.get(stat, 0) + run_stats_count[stat]
-
-
-                    avg_stats_disabled = {stat: stats_sum_disabled[stat] / stats_count_disabled[stat] for stat in stats_sum_disabled}
-
-                    with open(f"{folder_name}/average_results_{flag_str}_off.txt", "w") as f:
-                        f.write(f"Average results over {tries} runs:\n")
-                        f.write(f"Flag '{flag_desc}' disabled\n")
-                        f.write(f"Total Execution time: {total_time_disabled:.2f} seconds\n")
-                        for stat in avg_stats_disabled:
-                            f.write(f"Average {stat}: {avg_stats_disabled[stat]:.2f}\n")
-
-    print("All tests completed")
\ No newline at end of file
+    print("All tests completed")
@@ -1,32 +1,41 @@
 import argparse
-import random
+import os
 
-def generate_clause(n, k):
-    variables = list(range(1, n+1))
-    clause = random.sample(variables, k)
-    clause = [str(x) if random.random() > 0.5 else "-" + str(x) for x in clause]
-    return clause
+import numpy as np
 
-def negate_clause(clause_str):
-    literals = clause_str.split()
-    negated_literals = ["-"+literal if literal[0] != "-" else literal[1:] for literal in literals]
-    return " ".join(negated_literals)
+def generate_clause_batch(rng, n, k, count):
+    # Argsorting a random matrix yields k distinct variables per row in
+    # one vectorized call; signs are drawn for the whole batch at once
+    variables = np.argsort(rng.random((count, n)), axis=1)[:, :k] + 1
+    signs = rng.integers(0, 2, size=(count, k)) * 2 - 1
+    candidates = variables * signs
+    order = np.argsort(np.abs(candidates), axis=1)
+    return np.take_along_axis(candidates, order, axis=1)
 
 def generate_knf(n, c, k):
-    knf = "p cnf {} {}\n".format(n, c)
+    rng = np.random.default_rng()
+    buffer = bytearray(b"p cnf %d %d\n" % (n, c))
     clauses = set()
     while len(clauses) < c:
-        clause = generate_clause(n, k)
-        clause_str = " ".join(sorted(clause))
-        negated_clause_str = negate_clause(clause_str)
-        if clause_str not in clauses and negated_clause_str not in clauses:
-            clauses.add(clause_str)
-            knf += clause_str + " 0\n"
-    return knf
+        batch = generate_clause_batch(rng, n, k, max(c - len(clauses), 64))
+        for row in batch.tolist():
+            clause = tuple(row)
+            negated_clause = tuple(-literal for literal in clause)
+            if clause in clauses or negated_clause in clauses:
+                continue
+            clauses.add(clause)
+            buffer += b" ".join(b"%d" % literal for literal in clause) + b" 0\n"
+            if len(clauses) == c:
+                break
+    return bytes(buffer)
 
 def save_to_file(content, filename):
-    with open(filename, "w") as file:
-        file.write(content)
+    # One syscall, no text-mode encode pass
+    fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
 
 def main():
     parser = argparse.ArgumentParser(description='Generate random (n, c, k)-CNF in DIMACS format')
@@ -1,47 +1,55 @@
 import argparse
 import sys
 
+import numpy as np
+
 def generate_cnf_file(k: int, output_name: str = "Pebbling.cnf") -> None:
     if k < 2:
         print("n must be at least 2")
         sys.exit(1)
 
     num_literals = k * (k + 1) // 2
-    cnf = []
 
     # All source nodes must be either black or white
-    for i in range(k):
-        cnf.append([i + 1, i + num_literals + 1])
-
-    # Generate clauses for each node based on parent nodes
-    previous_line_length = k
-    current_line_size = 0
-
-    for v in range(k, num_literals):
-        current_line_size += 1
-        if current_line_size == previous_line_length:
-            previous_line_length = current_line_size - 1
-            current_line_size = 1
-
-        for a in range(2):
-            for b in range(2):
-                # Clauses for node v
-                cnf.append([
-                    -(v - previous_line_length + a * num_literals + 1),
-                    -(v - previous_line_length + 1 + b * num_literals + 1),
-                    v + 1,
-                    v + num_literals + 1
-                ])
+    sources = np.arange(k, dtype=np.int64)
+    source_clauses = np.stack((sources + 1, sources + num_literals + 1), axis=1)
+
+    # Generate clauses for each node based on parent nodes, one pyramid
+    # row at a time: the row of length length starts at node start and
+    # its nodes take parents from the row of length length + 1 below
+    color_a = np.array([0, 0, 1, 1], dtype=np.int64) * num_literals
+    color_b = np.array([0, 1, 0, 1], dtype=np.int64) * num_literals
+    node_blocks = []
+    start = k
+    for length in range(k - 1, 0, -1):
+        nodes = start + np.arange(length, dtype=np.int64)
+        first_parent = nodes - (length + 1)
+        second_parent = first_parent + 1
+        block = np.stack(
+            (-(first_parent[:, None] + color_a[None, :] + 1),
+             -(second_parent[:, None] + color_b[None, :] + 1),
+             np.broadcast_to(nodes[:, None] + 1, (length, 4)),
+             np.broadcast_to(nodes[:, None] + num_literals + 1, (length, 4))),
+            axis=2).reshape(-1, 4)
+        node_blocks.append(block)
+        start += length
+
+    node_clauses = (np.concatenate(node_blocks) if node_blocks
+                    else np.empty((0, 4), dtype=np.int64))
 
     # Final node may not have a stone
-    cnf.append([-num_literals])
-    cnf.append([-num_literals * 2])
+    final_clauses = [[-num_literals], [-num_literals * 2]]
 
-    # Write CNF to file
+    # Write CNF to file in one buffered pass
+    num_clauses = (source_clauses.shape[0] + node_clauses.shape[0]
+                   + len(final_clauses))
+    lines = [f"p cnf {k * (k + 1)} {num_clauses}\n"]
+    for clauses in (source_clauses.tolist(), node_clauses.tolist(),
+                    final_clauses):
+        lines.extend(" ".join(map(str, clause)) + " 0\n"
+                     for clause in clauses)
     with open(output_name, "w") as f:
-        f.write(f"p cnf {k * (k + 1)} {len(cnf)}\n")
-        for clause in cnf:
-            f.write(" ".join(map(str, clause)) + " 0\n")
+        f.write("".join(lines))
 
 def main():
     parser = argparse.ArgumentParser(description='Generate pebbling cnf in DIMACS format')
@@ -53,4 +61,4 @@ def main():
     generate_cnf_file(args.n, args.output)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
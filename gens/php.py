@@ -1,32 +1,36 @@
 import argparse
 import sys
 
+import numpy as np
+
 def generate_php_cnf_file(n: int, output_name: str = "PHP.cnf") -> None:
     if n < 1:
         print("n must be at least 1")
         sys.exit(1)
 
-    cnf = []
-
     # Each pigeon must be in at least one nest
     # i = Pigeon column, j = Nest row (row major order)
-    for i in range(n + 1):
-        clause = []
-        for j in range(n):
-            clause.append(i + j * (n + 1) + 1)
-        cnf.append(clause)
-
-    # No two pigeons can be in the same nest
-    for j in range(n):
-        for i1 in range(n + 1):
-            for i2 in range(i1 + 1, n + 1):
-                cnf.append([-(i1 + j * (n + 1) + 1), -(i2 + j * (n + 1) + 1)])
-
-    # Write CNF to file
+    pigeons = np.arange(n + 1, dtype=np.int64)
+    nests = np.arange(n, dtype=np.int64)
+    at_least_one = pigeons[:, None] + nests[None, :] * (n + 1) + 1
+
+    # No two pigeons can be in the same nest: one pair row per nest and
+    # per unordered pigeon pair, in the same order the nested loops gave
+    i1, i2 = np.triu_indices(n + 1, k=1)
+    nest_offsets = nests[:, None] * (n + 1) + 1
+    at_most_one = -np.stack(
+        (i1[None, :] + nest_offsets, i2[None, :] + nest_offsets),
+        axis=2).reshape(-1, 2)
+
+    # Write CNF to file in one buffered pass
+    num_clauses = at_least_one.shape[0] + at_most_one.shape[0]
+    lines = [f"p cnf {n * (n + 1)} {num_clauses}\n"]
+    lines.extend(" ".join(map(str, clause)) + " 0\n"
+                 for clause in at_least_one.tolist())
+    lines.extend(" ".join(map(str, clause)) + " 0\n"
+                 for clause in at_most_one.tolist())
     with open(output_name, "w") as f:
-        f.write(f"p cnf {n * (n + 1)} {len(cnf)}\n")
-        for clause in cnf:
-            f.write(" ".join(map(str, clause)) + " 0\n")
+        f.write("".join(lines))
 
 def main():
     parser = argparse.ArgumentParser(description='Generate php cnf in DIMACS format')
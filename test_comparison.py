@@ -1,38 +1,202 @@
+import multiprocessing
 import subprocess
+import contextlib
+import importlib.util
+import threading
 import argparse
+import tempfile
+import hashlib
+import shutil
+import atexit
+import runpy
+import json
 import time
 import sys
+import io
 import os
 
-def run_cadical():
-    start_time = time.time()
-    result = subprocess.call(['cadical/build/cadical', "output.cnf"], stdout=subprocess.DEVNULL)
-    end_time = time.time()
-    return result, end_time - start_time
+# One /dev/null fd for every child process instead of letting Popen
+# open and close its own per call
+DEVNULL_FD = os.open(os.devnull, os.O_WRONLY)
+atexit.register(os.close, DEVNULL_FD)
 
+# Generator modules, loaded lazily once per pool worker so trials call
+# their generate functions directly instead of spawning python3
+_generator_modules = {}
+
+def generator_module(path):
+    module = _generator_modules.get(path)
+    if module is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _generator_modules[path] = module
+    return module
+
+# CaDiCaL's answer depends only on the CNF bytes, so deterministic
+# instances (PHP, Pebbling) need at most one run per distinct formula;
+# the cache persists across invocations of this script
+CADICAL_CACHE_PATH = "cadical_cache.json"
+_cadical_cache = None
+
+def cadical_cache():
+    global _cadical_cache
+    if _cadical_cache is None:
+        try:
+            with open(CADICAL_CACHE_PATH) as f:
+                _cadical_cache = json.load(f)
+        except (OSError, ValueError):
+            _cadical_cache = {}
+    return _cadical_cache
+
+def cadical_cache_put(cnf_hash, result, time_ns):
+    cache = cadical_cache()
+    cache[cnf_hash] = [result, time_ns]
+    # Atomic rewrite; concurrent workers may race but every writer
+    # leaves a valid file and the entries are deterministic anyway
+    temp_path = f"{CADICAL_CACHE_PATH}.{os.getpid()}"
+    with open(temp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(temp_path, CADICAL_CACHE_PATH)
+
+def start_cadical(cnf_path):
+    # close_fds=False lets Popen take the posix_spawn fast path instead
+    # of fork+exec, which matters with numpy/numba resident in the
+    # parent; Python file descriptors are non-inheritable by default,
+    # so nothing leaks into the child
+    return subprocess.Popen(['cadical/build/cadical', cnf_path],
+                            stdout=DEVNULL_FD, close_fds=False)
+
+
+def solver_args(solver_path, cnf_path):
+    args = ["--input", cnf_path]
 
-def run_solver(solver_path):
-    cmd = ['python3', solver_path, "--input", "output.cnf"]
-    
     if('cdcl.py' in solver_path):
-        cmd.append('--vsids')
-        cmd.append('--restarts')
-        cmd.append('--learn')
-        cmd.append('--delete')
-        cmd.append('--minimize')
-        
+        args.append('--vsids')
+        args.append('--restarts')
+        args.append('--learn')
+        args.append('--delete')
+        args.append('--minimize')
+        # The DRAT proof goes to stdout, where the harness captures it
+        # and pipes it into drat-trim without an intermediate file
+        args.append('--proof')
+        args.append('-')
+
     elif('dpll.py' in solver_path):
-        cmd.append('--pure')
-        
-    start_time = time.time()
-    result = subprocess.call(cmd, stdout=subprocess.DEVNULL)
-    end_time = time.time()
-    
-    return result, end_time - start_time
-
-def run_drat_trim():
-    result = subprocess.call(["./drat-trim/drat-trim", "output.cnf", "unsat.drat"], stdout=subprocess.DEVNULL)
-    return result
+        args.append('--pure')
+
+    return args
+
+
+def run_solver(solver_path, cnf_path):
+    # Execute the solver script in-process instead of spawning python3:
+    # interpreter startup and the numpy/numba imports happen once per
+    # pool worker and are amortized over all its trials
+    saved_argv = sys.argv
+    sys.argv = [solver_path] + solver_args(solver_path, cnf_path)
+    # python3 <script> puts the script's directory on sys.path; mirror
+    # that so sibling imports (e.g. cdcl.py's trail) keep resolving
+    script_dir = os.path.dirname(os.path.abspath(solver_path))
+    sys.path.insert(0, script_dir)
+    stdout_buffer = io.StringIO()
+    result = 0
+    start_time = time.perf_counter_ns()
+    try:
+        with contextlib.redirect_stdout(stdout_buffer):
+            try:
+                runpy.run_path(solver_path, run_name="__main__")
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    result = e.code
+                elif e.code is not None:
+                    result = 1
+    finally:
+        sys.argv = saved_argv
+        sys.path.remove(script_dir)
+    return result, time.perf_counter_ns() - start_time, stdout_buffer.getvalue()
+
+def wait_timed(process, start_time, into, timeout):
+    # Record the process's own exit code and finish time so each
+    # solver's duration is attributed correctly even though both run
+    # at the same time; a hung process is killed and reported as -1
+    # so one bad trial cannot stall the whole matrix
+    try:
+        into[0] = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        into[0] = -1
+    into[1] = time.perf_counter_ns() - start_time
+
+def run_drat_trim(cnf_path, proof_bytes, timeout):
+    # The proof never touches disk: drat-trim reads it off the pipe
+    process = subprocess.Popen(["./drat-trim/drat-trim", cnf_path, "/dev/stdin"],
+                               stdin=subprocess.PIPE, stdout=DEVNULL_FD,
+                               close_fds=False)
+    try:
+        process.communicate(proof_bytes, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        return -1
+    return process.returncode
+
+def run_trial(task):
+    # One independent trial on trial-private files, so trials can run
+    # on separate cores without racing on output.cnf/unsat.drat
+    i, solver, n, generator, work_dir, timeout = task
+    cnf_path = os.path.join(work_dir, f"output_{i}.cnf")
+
+    if(generator == "r"):
+        knf_gen = generator_module('gens/knf_gen.py')
+        knf_gen.save_to_file(knf_gen.generate_knf(n, round(4.0 * int(n)), 3), cnf_path)
+
+    elif(generator == "php"):
+        generator_module('gens/php.py').generate_php_cnf_file(n, cnf_path)
+
+    elif(generator == "peb"):
+        generator_module('gens/pebbling.py').generate_cnf_file(n, cnf_path)
+    else:
+        print("Invalid generator")
+        sys.exit(1)
+
+    with open(cnf_path, "rb") as f:
+        cnf_hash = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    cached = cadical_cache().get(cnf_hash)
+
+    if cached is not None:
+        # Known formula: reuse CaDiCaL's result (and its first-run
+        # time, so the totals stay comparable) and only run the solver
+        resultCad, timeCad = cached
+        resultSolver, timeSolver, solver_output = run_solver(solver, cnf_path)
+    else:
+        # Both solvers only read the CNF, so run them side by side: the
+        # trial then takes max(tCad, tSolver) instead of their sum.
+        # CaDiCaL is its own process, so it keeps running while the
+        # worker executes the Python solver in-process
+        start_time = time.perf_counter_ns()
+        cadical_process = start_cadical(cnf_path)
+        cadical_result = [0, 0]
+        waiter = threading.Thread(target=wait_timed,
+                                  args=(cadical_process, start_time, cadical_result, timeout))
+        waiter.start()
+        resultSolver, timeSolver, solver_output = run_solver(solver, cnf_path)
+        waiter.join()
+        resultCad, timeCad = cadical_result
+        if resultCad != -1:
+            cadical_cache_put(cnf_hash, resultCad, timeCad)
+
+    resultDrat = 0
+    if 'cdcl.py' in solver and resultCad == 20:
+        # Whatever the solver printed besides status and comment lines
+        # is the DRAT proof
+        proof = "".join(line for line in solver_output.splitlines(keepends=True)
+                        if not line.startswith(("s", "c")))
+        resultDrat = run_drat_trim(cnf_path, proof.encode(), timeout)
+
+    os.remove(cnf_path)
+    return resultCad, timeCad, resultSolver, timeSolver, resultDrat
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Run CaDiCaL and custom solver with a CNF file')
@@ -40,48 +204,51 @@ if __name__ == "__main__":
     parser.add_argument('-n', type=int, default=10, help='Number of variables (default: 10)')
     parser.add_argument('--tries', '-t', type=int, default=10, help='Number of tries (default: 10)')
     parser.add_argument('--generator', '-g', type=str, default="r", help='php=PHP,r=RANDOM, peb=PEBBLING (default: random)')
+    parser.add_argument('--tmpdir', default='/dev/shm' if os.path.isdir('/dev/shm') else None,
+                        help='Directory for intermediate CNF files (default: /dev/shm when available)')
+    parser.add_argument('--timeout', type=float, default=120,
+                        help='Per-process timeout in seconds for CaDiCaL and drat-trim (default: 120)')
     args = parser.parse_args()
     statTimeCad = 0
     statTimeSolver = 0
-    
-    
-    for i in range(args.tries):
-        if(args.generator == "r"):
-            subprocess.run(['python3', 'gens/knf_gen.py', str(args.n), str(round(4.0 * int(args.n))), "3"], stdout=subprocess.DEVNULL)
-        
-        elif(args.generator == "php"):
-            subprocess.run(['python3', 'gens/php.py', str(args.n)], stdout=subprocess.DEVNULL)
-        
-        elif(args.generator == "peb"):
-            subprocess.run(['python3', 'gens/pebbling.py', str(args.n)], stdout=subprocess.DEVNULL)
-        else:
-            print("Invalid generator")
-            sys.exit(1)
-        
-        resultCad, timeCad = run_cadical()
-        statTimeCad += timeCad
-        resultSolver, timeSolver = run_solver(args.solver)
-        statTimeSolver += timeSolver
-        print("Cadical: ", resultCad, "; Solver: ", resultSolver)
-        
-        if (resultSolver != resultCad):
-            print()
-            print("Error: Solver output does not match Cadical output")
-            print("Cadical: ", resultCad)
-            print("Solver: ", resultSolver)
-            sys.exit(1)
-            
-        if 'cdcl.py' in args.solver and resultCad == 20:
-            resultDrat = run_drat_trim()
-            if resultDrat != 0:
-                print()
-                print(f"Error: {args.solver} did not produce a correct proof")
-                sys.exit(1)
-            
+
+    # Intermediate CNFs live in a scratch directory, on tmpfs when
+    # available, so short trials are not bounded by disk writes
+    work_dir = tempfile.mkdtemp(dir=args.tmpdir)
+    tasks = [(i, args.solver, args.n, args.generator, work_dir, args.timeout) for i in range(args.tries)]
+
+    # Trials are independent, so fan them out over the cores and check
+    # the results in order as they come back; leaving the with-block on
+    # a mismatch terminates the remaining workers
+    try:
+        with multiprocessing.Pool(processes=os.cpu_count()) as pool:
+            for resultCad, timeCad, resultSolver, timeSolver, resultDrat in pool.imap(run_trial, tasks):
+                statTimeCad += timeCad
+                statTimeSolver += timeSolver
+                print("Cadical: ", resultCad, "; Solver: ", resultSolver)
+
+                if resultCad == -1 or resultDrat == -1:
+                    # A killed process proves nothing either way; log
+                    # the timeout instead of reporting a mismatch
+                    print(f"Timeout: trial exceeded {args.timeout}s, skipping comparison")
+                    continue
+
+                if (resultSolver != resultCad):
+                    print()
+                    print("Error: Solver output does not match Cadical output")
+                    print("Cadical: ", resultCad)
+                    print("Solver: ", resultSolver)
+                    sys.exit(1)
+
+                if resultDrat != 0:
+                    print()
+                    print(f"Error: {args.solver} did not produce a correct proof")
+                    sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
     print("All tests passed")
-    print("Time spent in Cadical: ", statTimeCad, "s")
-    print("Time spent in Solver: ", statTimeSolver, "s")
-    os.remove("output.cnf")
-    if os.path.exists("unsat.drat"):
-        os.remove("unsat.drat")
-        
\ No newline at end of file
+    # Times accumulate as integer nanoseconds and convert to seconds
+    # only here, so repeated float additions never round the totals
+    print("Time spent in Cadical: ", statTimeCad / 1e9, "s")
+    print("Time spent in Solver: ", statTimeSolver / 1e9, "s")
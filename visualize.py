@@ -1,49 +1,86 @@
+import matplotlib
+matplotlib.use('Agg')  # headless rendering only, skip any GUI backend
 import matplotlib.pyplot as plt
+import multiprocessing
+import pandas as pd
+import numpy as np
 import os
-import re
 
 def parse_avg_results(file_path):
+    # The format is fixed ("Average <stat>: <value> ..."), so plain
+    # string slicing beats running a regex over every line
     avg_results = {}
-    regex = re.compile(r"Average ([a-zA-Z ]+): ([0-9.]+)")
-    
     with open(file_path, 'r') as file:
         for line in file:
-            match = regex.search(line)
-            if match:
-                stat = match.group(1).strip()
-                value = float(match.group(2).strip())
-                avg_results[stat] = value
+            if not line.startswith("Average "):
+                continue
+            stat, sep, value = line[8:].partition(": ")
+            if not sep:
+                continue
+            try:
+                avg_results[stat.strip()] = float(value.split()[0])
+            except ValueError:
+                continue
     return avg_results
 
-def plot_cdcl_vs_dpll(data_cdcl, data_dpll, data_dp, xlabel, ylabel, title, output_file):
-    plt.figure(figsize=(10, 6))
-    
-    plt.plot(data_cdcl['x'], data_cdcl['y'], marker='o', linestyle='--', label='CDCL')
-    plt.plot(data_dpll['x'], data_dpll['y'], marker='s', linestyle='-', label='DPLL')
-    
+def extract_series(results, solver, generator, config, stat):
+    # Pull one plot series out of the results table: x is n ascending,
+    # y the chosen statistic with missing values as 0 (dp result files
+    # carry no propagation/decision stats, for example). Series stay
+    # numpy arrays all the way into plotting, which has a fast path
+    # for ndarray inputs
+    if results.empty:
+        return {'x': np.empty(0, dtype=np.int64), 'y': np.empty(0)}
+    rows = results[(results['solver'] == solver)
+                   & (results['generator'] == generator)
+                   & (results['config'] == config)].sort_values('n')
+    if stat not in rows.columns:
+        return {'x': rows['n'].to_numpy(), 'y': np.zeros(len(rows))}
+    return {'x': rows['n'].to_numpy(), 'y': rows[stat].fillna(0).to_numpy()}
+
+# Each pool worker builds its Figure/Axes pair once on first use;
+# Figures are not picklable, so they cannot travel with the jobs
+_worker_figure = None
+
+def render_plot(job):
+    global _worker_figure
+    if _worker_figure is None:
+        _worker_figure = plt.subplots(figsize=(10, 6))
+    fig, ax = _worker_figure
+    kind, plot_args = job
+    if kind == 'graphs':
+        plot_graphs(fig, ax, *plot_args)
+    else:
+        plot_cdcl_vs_dpll(fig, ax, *plot_args)
+
+def plot_cdcl_vs_dpll(fig, ax, data_cdcl, data_dpll, data_dp, xlabel, ylabel, title, output_file):
+    ax.clear()
+
+    ax.plot(data_cdcl['x'], data_cdcl['y'], marker='o', linestyle='--', label='CDCL')
+    ax.plot(data_dpll['x'], data_dpll['y'], marker='s', linestyle='-', label='DPLL')
+
     if data_dp is not None:
-        plt.plot(data_dp['x'], data_dp['y'], marker='p', linestyle='-', label='DP')
-    
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.title(title)
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("png/" + output_file)
-    plt.clf()
-
-def plot_graphs(data, xlabel, ylabel, title, output_file):
+        ax.plot(data_dp['x'], data_dp['y'], marker='p', linestyle='-', label='DP')
+
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True)
+    fig.savefig("png/" + output_file)
+
+def plot_graphs(fig, ax, data, xlabel, ylabel, title, output_file):
+    ax.clear()  # Reuse the one figure instead of creating a new one
     for key, values in data.items():
-        if values['x'] and values['y']:  # Ensure there is data to plot
-            plt.plot(values['x'], values['y'], marker='o', label=key)
-    
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.title(title)
-    plt.legend()
-    plt.grid(True)
-    plt.savefig("png/" + output_file)
-    plt.clf()  # Clear the plot for the next graph
+        if len(values['x']) and len(values['y']):  # Ensure there is data to plot
+            ax.plot(values['x'], values['y'], marker='o', label=key)
+
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True)
+    fig.savefig("png/" + output_file)
 
 if __name__ == "__main__":
     solvers = ['cdcl', 'dpll', 'dp']
@@ -71,112 +108,100 @@ if __name__ == "__main__":
         }
     }
 
-    cdcl_vs_dpll_time = {solver: {generator: {'x': [], 'y': []} for generator in generators} for solver in solvers}
-    cdcl_vs_dpll_propagations = {solver: {generator: {'x': [], 'y': []} for generator in generators} for solver in solvers}
-    cdcl_vs_dpll_decisions = {solver: {generator: {'x': [], 'y': []} for generator in generators} for solver in solvers}
-
+    # Parse every average-results file once into a flat table; the
+    # plot series below are just filtered, sorted views of it. One
+    # scandir of temp/ replaces a stat() call per candidate folder
+    temp_folders = ({entry.name for entry in os.scandir('temp') if entry.is_dir()}
+                    if os.path.isdir('temp') else set())
+    records = []
     for solver in solvers:
         for generator in generators:
-            data_time = {}
-            data_propagations = {}
-            data_decisions = {}
-
             for flag in flags[solver]:
-                flag_str = flag
-                folder_prefix = f"temp/{solver}_{generator}_"
-
-                key_disabled = f"{solver}_{generator}_{flag}_disabled"
-                data_time[key_disabled] = {'x': [], 'y': []}
-                data_propagations[key_disabled] = {'x': [], 'y': []}
-                data_decisions[key_disabled] = {'x': [], 'y': []}
-
                 for n in nsolvers[solver][generator]:
-                    folder_name = f"{folder_prefix}{n}_{flag_str}_off"
-                    avg_results_disabled_path = os.path.join(folder_name, f"average_results_{flag_str}_off.txt")
-                    
-                    if os.path.exists(avg_results_disabled_path):
-                        avg_results_disabled = parse_avg_results(avg_results_disabled_path)
-                        
-                        
-                        data_time[key_disabled]['x'].append(n)
-                        data_time[key_disabled]['y'].append(avg_results_disabled.get('Time', 0))
-
-                        data_propagations[key_disabled]['x'].append(n)
-                        data_propagations[key_disabled]['y'].append(avg_results_disabled.get('Number of Unit Propagations', 0))
-
-                        data_decisions[key_disabled]['x'].append(n)
-                        data_decisions[key_disabled]['y'].append(avg_results_disabled.get('Number of Decisions', 0))
-
-            # Handle all flags enabled
-            folder_prefix = f"temp/{solver}_{generator}_"
-            key_enabled = f"{solver}_{generator}_all_flags_enabled"
-            data_time[key_enabled] = {'x': [], 'y': []}
-            data_propagations[key_enabled] = {'x': [], 'y': []}
-            data_decisions[key_enabled] = {'x': [], 'y': []}
-
-            for n in nsolvers[solver][generator]:
-                folder_name_enabled = f"{folder_prefix}{n}_all_flags_enabled"
-                avg_results_enabled_path = os.path.join(folder_name_enabled, "average_results_all_flags_enabled.txt")
-                if(solver == 'dp'):
-                    print(n)
-                    print(avg_results_enabled_path)
-
-                if os.path.exists(avg_results_enabled_path):
-                    avg_results_enabled = parse_avg_results(avg_results_enabled_path)
-
-
-                    data_time[key_enabled]['x'].append(n)
-                    data_time[key_enabled]['y'].append(avg_results_enabled.get('Time', 0))
-                    if(solver == 'dp'):
+                    folder = f"{solver}_{generator}_{n}_{flag}_off"
+                    if folder not in temp_folders:
                         continue
+                    path = os.path.join("temp", folder,
+                                        f"average_results_{flag}_off.txt")
+                    try:
+                        avg_results = parse_avg_results(path)
+                    except FileNotFoundError:
+                        continue
+                    records.append({'solver': solver, 'generator': generator,
+                                    'config': f"{flag}_disabled", 'n': n,
+                                    **avg_results})
+            for n in nsolvers[solver][generator]:
+                folder = f"{solver}_{generator}_{n}_all_flags_enabled"
+                if folder not in temp_folders:
+                    continue
+                path = os.path.join("temp", folder,
+                                    "average_results_all_flags_enabled.txt")
+                try:
+                    avg_results = parse_avg_results(path)
+                except FileNotFoundError:
+                    continue
+                records.append({'solver': solver, 'generator': generator,
+                                'config': 'all_flags_enabled', 'n': n,
+                                **avg_results})
+
+    results = pd.DataFrame(records)
+
+    # Charts are independent once their series are extracted, so
+    # collect every plot call as a job of plain lists and dicts and
+    # render them concurrently; PNG encoding is CPU-bound per figure
+    plot_jobs = []
+
+    metrics = [
+        ('Time', 'Execution time (s)', 'Execution Time', 'execution_time'),
+        ('Number of Unit Propagations', 'Unit propagations', 'Unit Propagations', 'unit_propagations'),
+        ('Number of Decisions', 'Decisions', 'Decisions', 'decisions'),
+    ]
 
-                    data_propagations[key_enabled]['x'].append(n)
-                    data_propagations[key_enabled]['y'].append(avg_results_enabled.get('Number of Unit Propagations', 0))
-
-                    data_decisions[key_enabled]['x'].append(n)
-                    data_decisions[key_enabled]['y'].append(avg_results_enabled.get('Number of Decisions', 0))
-
-            # Store data for CDCL vs DPLL comparison
-            cdcl_vs_dpll_time[solver][generator] = data_time[key_enabled]
-            cdcl_vs_dpll_propagations[solver][generator] = data_propagations[key_enabled]
-            cdcl_vs_dpll_decisions[solver][generator] = data_decisions[key_enabled]
-            if(solver == 'dp'):
-                continue
-
-            # Plot and save graphs for each solver and generator combination
-            plot_graphs(data_time, 'n', 'Execution time (s)', 
-                        f'Execution Time vs n for {solver.upper()} and {generator}', 
-                        f'{solver}_{generator}_execution_time.png')
-
-            plot_graphs(data_propagations, 'n', 'Unit propagations', 
-                        f'Unit Propagations vs n for {solver.upper()} and {generator}', 
-                        f'{solver}_{generator}_unit_propagations.png')
-
-            plot_graphs(data_decisions, 'n', 'Decisions', 
-                        f'Decisions vs n for {solver.upper()} and {generator}', 
-                        f'{solver}_{generator}_decisions.png')
+    for solver in solvers:
+        if solver == 'dp':
+            continue  # dp only feeds the comparison plots below
+        for generator in generators:
+            for stat, ylabel, title_part, file_part in metrics:
+                data = {}
+                for flag in flags[solver]:
+                    data[f"{solver}_{generator}_{flag}_disabled"] = extract_series(
+                        results, solver, generator, f"{flag}_disabled", stat)
+                data[f"{solver}_{generator}_all_flags_enabled"] = extract_series(
+                    results, solver, generator, 'all_flags_enabled', stat)
+
+                plot_jobs.append(('graphs', (data, 'n', ylabel,
+                                  f'{title_part} vs n for {solver.upper()} and {generator}',
+                                  f'{solver}_{generator}_{file_part}.png')))
 
     # After the main loop, create CDCL vs DPLL comparison graphs
     for generator in generators:
         if(generator == 'Random'):
-            dp_time = cdcl_vs_dpll_time['dp'][generator]
-            print(dp_time)
+            dp_time = extract_series(results, 'dp', generator, 'all_flags_enabled', 'Time')
         else:
             dp_time = None
-        
-        plot_cdcl_vs_dpll(cdcl_vs_dpll_time['cdcl'][generator], cdcl_vs_dpll_time['dpll'][generator], dp_time, 
-                          'n', 'Execution time (s)', 
-                          f'CDCL vs DPLL: Execution Time for {generator}', 
-                          f'cdcl_vs_dpll_{generator}_execution_time.png')
-
-        plot_cdcl_vs_dpll(cdcl_vs_dpll_propagations['cdcl'][generator], cdcl_vs_dpll_propagations['dpll'][generator], None, 
-                          'n', 'Unit propagations', 
-                          f'CDCL vs DPLL: Unit Propagations for {generator}', 
-                          f'cdcl_vs_dpll_{generator}_unit_propagations.png')
-
-        plot_cdcl_vs_dpll(cdcl_vs_dpll_decisions['cdcl'][generator], cdcl_vs_dpll_decisions['dpll'][generator], None, 
-                          'n', 'Decisions', 
-                          f'CDCL vs DPLL: Decisions for {generator}', 
-                          f'cdcl_vs_dpll_{generator}_decisions.png')
+
+        plot_jobs.append(('cdcl_vs_dpll', (
+            extract_series(results, 'cdcl', generator, 'all_flags_enabled', 'Time'),
+            extract_series(results, 'dpll', generator, 'all_flags_enabled', 'Time'), dp_time,
+            'n', 'Execution time (s)',
+            f'CDCL vs DPLL: Execution Time for {generator}',
+            f'cdcl_vs_dpll_{generator}_execution_time.png')))
+
+        plot_jobs.append(('cdcl_vs_dpll', (
+            extract_series(results, 'cdcl', generator, 'all_flags_enabled', 'Number of Unit Propagations'),
+            extract_series(results, 'dpll', generator, 'all_flags_enabled', 'Number of Unit Propagations'), None,
+            'n', 'Unit propagations',
+            f'CDCL vs DPLL: Unit Propagations for {generator}',
+            f'cdcl_vs_dpll_{generator}_unit_propagations.png')))
+
+        plot_jobs.append(('cdcl_vs_dpll', (
+            extract_series(results, 'cdcl', generator, 'all_flags_enabled', 'Number of Decisions'),
+            extract_series(results, 'dpll', generator, 'all_flags_enabled', 'Number of Decisions'), None,
+            'n', 'Decisions',
+            f'CDCL vs DPLL: Decisions for {generator}',
+            f'cdcl_vs_dpll_{generator}_decisions.png')))
+
+    with multiprocessing.Pool() as pool:
+        pool.map(render_plot, plot_jobs)
 
     print("All graphs, including CDCL vs DPLL comparisons, have been generated and saved.")
\ No newline at end of file